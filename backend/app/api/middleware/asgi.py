@@ -0,0 +1,54 @@
+"""
+Helpers shared by the pure ASGI middlewares.
+"""
+
+from typing import Any, Dict, Optional
+
+import orjson
+from starlette.types import Scope, Send
+
+
+def get_header(scope: Scope, name: bytes) -> Optional[str]:
+    """Get a request header from the ASGI scope (name must be lowercase bytes)."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def get_client_ip(scope: Scope) -> str:
+    """Get client IP address from the ASGI scope."""
+    # Check for forwarded headers (when behind proxy)
+    forwarded_for = get_header(scope, b"x-forwarded-for")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+
+    real_ip = get_header(scope, b"x-real-ip")
+    if real_ip:
+        return real_ip
+
+    # Fallback to direct client IP
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def send_json_response(
+    send: Send,
+    status_code: int,
+    content: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None
+) -> None:
+    """Send a complete JSON response without building a Response object."""
+    body = orjson.dumps(content)
+    raw_headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+    ]
+    if headers:
+        raw_headers.extend(
+            (key.lower().encode("latin-1"), value.encode("latin-1"))
+            for key, value in headers.items()
+        )
+
+    await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
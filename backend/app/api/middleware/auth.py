@@ -7,8 +7,9 @@ from typing import Optional
 
 from fastapi import HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.api.middleware.asgi import get_client_ip, get_header, send_json_response
 from app.core.logging import log_security_event, log_request_safely
 from app.core.security import get_security_manager
 
@@ -18,11 +19,17 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Authentication middleware to validate JWT tokens."""
+class AuthMiddleware:
+    """
+    Authentication middleware to validate JWT tokens.
     
-    # Paths that don't require authentication
-    EXEMPT_PATHS = {
+    Implemented as plain ASGI rather than BaseHTTPMiddleware so requests
+    aren't pumped through an extra task and memory stream.
+    """
+    
+    # Paths that don't require authentication (checked before any header
+    # parsing, so probes and docs never touch the token path)
+    EXEMPT_PATHS = frozenset({
         "/",
         "/health",
         "/api/v1/health/supabase",
@@ -48,38 +55,64 @@ class AuthMiddleware(BaseHTTPMiddleware):
         # Business context endpoints (for testing)
         "/api/v1/trend-analysis/business-context",
         "/api/v1/trend-analysis/summary",
-    }
+    })
+    
+    # OAuth URL generator (GET only)
+    OAUTH_URL_PATH = "/api/v1/shopify/oauth/authorize"
     
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.security_manager = get_security_manager()
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request and validate authentication."""
+        if scope["type"] != "http" or self._is_public(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            await self._authenticate(scope)
+        except HTTPException as exc:
+            await send_json_response(send, exc.status_code, {"detail": exc.detail}, exc.headers)
+            return
+        
+        await self.app(scope, receive, send)
+    
+    def _is_public(self, scope: Scope) -> bool:
+        """Check whether the request can skip authentication."""
+        path = scope["path"]
+        method = scope["method"]
         
         # Skip authentication for exempt paths
-        if request.url.path in self.EXEMPT_PATHS:
-            return await call_next(request)
+        if path in self.EXEMPT_PATHS:
+            return True
         
         # Skip authentication for paths that match patterns (for testing endpoints with parameters)
-        if (request.url.path.startswith("/api/v1/trend-analysis/business-context/") or
-            request.url.path.startswith("/api/v1/trend-analysis/insights/") and request.url.path.endswith("/summary") or
-            request.url.path.startswith("/api/v1/video/avatar/status/")):
-            return await call_next(request)
+        if (path.startswith("/api/v1/trend-analysis/business-context/") or
+            path.startswith("/api/v1/trend-analysis/insights/") and path.endswith("/summary") or
+            path.startswith("/api/v1/video/avatar/status/")):
+            return True
         
         # Skip authentication for OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        if method == "OPTIONS":
+            return True
+        
+        # The GET OAuth URL generator is a public test endpoint; POST stays protected
+        return method == "GET" and path == self.OAUTH_URL_PATH
+    
+    async def _authenticate(self, scope: Scope) -> None:
+        """Validate the bearer token and store the user in the request state."""
+        path = scope["path"]
         
         # Extract and validate token
         try:
-            token = self._extract_token(request)
+            token = self._extract_token(scope)
             if not token:
                 log_security_event(
                     "missing_token",
-                    ip_address=self._get_client_ip(request),
-                    user_agent=request.headers.get("user-agent"),
-                    path=request.url.path
+                    ip_address=get_client_ip(scope),
+                    user_agent=get_header(scope, b"user-agent"),
+                    path=path
                 )
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -92,9 +125,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
             if not user:
                 log_security_event(
                     "invalid_token",
-                    ip_address=self._get_client_ip(request),
-                    user_agent=request.headers.get("user-agent"),
-                    path=request.url.path
+                    ip_address=get_client_ip(scope),
+                    user_agent=get_header(scope, b"user-agent"),
+                    path=path
                 )
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -102,15 +135,16 @@ class AuthMiddleware(BaseHTTPMiddleware):
                     headers={"WWW-Authenticate": "Bearer"},
                 )
             
-            # Add user information to request state
-            request.state.user = user
-            request.state.user_id = user["id"]
-            request.state.token = token
+            # Add user information to request state (backs request.state)
+            state = scope.setdefault("state", {})
+            state["user"] = user
+            state["user_id"] = user["id"]
+            state["token"] = token
             
             # Only log authentication for sensitive endpoints using safe logging
-            if request.url.path.startswith("/api/v1/auth/") or request.url.path.startswith("/api/v1/sync/"):
+            if path.startswith("/api/v1/auth/") or path.startswith("/api/v1/sync/"):
                 log_request_safely(
-                    request,
+                    Request(scope),
                     f"User authenticated for sensitive endpoint",
                     level="info",
                     user_id=user['id'],
@@ -123,22 +157,19 @@ class AuthMiddleware(BaseHTTPMiddleware):
             logger.error(f"Authentication error: {e}")
             log_security_event(
                 "auth_error",
-                ip_address=self._get_client_ip(request),
-                user_agent=request.headers.get("user-agent"),
-                path=request.url.path,
+                ip_address=get_client_ip(scope),
+                user_agent=get_header(scope, b"user-agent"),
+                path=path,
                 error=str(e)
             )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Authentication service error"
             )
-        
-        response = await call_next(request)
-        return response
     
-    def _extract_token(self, request: Request) -> Optional[str]:
+    def _extract_token(self, scope: Scope) -> Optional[str]:
         """Extract JWT token from request headers."""
-        authorization = request.headers.get("Authorization")
+        authorization = get_header(scope, b"authorization")
         if not authorization:
             return None
         
@@ -149,20 +180,6 @@ class AuthMiddleware(BaseHTTPMiddleware):
             return token
         except ValueError:
             return None
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Get client IP address from request."""
-        # Check for forwarded headers (when behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # Fallback to direct client IP
-        return request.client.host if request.client else "unknown"
 
 
 async def get_current_user(request: Request) -> dict:
@@ -200,40 +217,44 @@ def require_auth(request: Request) -> dict:
     return request.state.user if hasattr(request.state, "user") else None
 
 
-class OptionalAuthMiddleware(BaseHTTPMiddleware):
+class OptionalAuthMiddleware:
     """Optional authentication middleware that doesn't fail on missing tokens."""
     
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.security_manager = get_security_manager()
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with optional authentication."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        state = scope.setdefault("state", {})
         
         # Try to extract and validate token
         try:
-            token = self._extract_token(request)
+            token = self._extract_token(scope)
             if token:
                 user = await self.security_manager.get_user_from_token(token)
                 if user:
-                    request.state.user = user
-                    request.state.user_id = user["id"]
-                    request.state.token = token
-                    request.state.authenticated = True
+                    state["user"] = user
+                    state["user_id"] = user["id"]
+                    state["token"] = token
+                    state["authenticated"] = True
                 else:
-                    request.state.authenticated = False
+                    state["authenticated"] = False
             else:
-                request.state.authenticated = False
+                state["authenticated"] = False
         except Exception as e:
             logger.warning(f"Optional auth error: {e}")
-            request.state.authenticated = False
+            state["authenticated"] = False
         
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
     
-    def _extract_token(self, request: Request) -> Optional[str]:
+    def _extract_token(self, scope: Scope) -> Optional[str]:
         """Extract JWT token from request headers."""
-        authorization = request.headers.get("Authorization")
+        authorization = get_header(scope, b"authorization")
         if not authorization:
             return None
         
@@ -0,0 +1,24 @@
+"""
+Response compression middleware for FastAPI.
+"""
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves probe and root responses untouched."""
+    
+    # Tiny fixed payloads hit by probes; not worth wrapping `send` for
+    SKIP_PATHS = frozenset({
+        "/",
+        "/health",
+        "/api/v1/health/supabase",
+    })
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,101 @@
+"""
+Error handling middleware for FastAPI.
+"""
+
+import logging
+from datetime import datetime
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.rich_protection import safe_format_exception
+
+logger = logging.getLogger(__name__)
+
+# Only the timestamp of the 500 payload changes, so everything before it is
+# serialized once and the timestamp is spliced in per error
+_ERROR_BODY_PREFIX = orjson.dumps({
+    "error": "Internal server error",
+    "message": "An unexpected error occurred",
+})[:-1] + b',"timestamp":"'
+_ERROR_BODY_SUFFIX = b'"}'
+
+
+def _error_body() -> bytes:
+    """Build the canned 500 payload with the current UTC timestamp."""
+    timestamp = datetime.utcnow().isoformat().encode("latin-1")
+    return _ERROR_BODY_PREFIX + timestamp + _ERROR_BODY_SUFFIX
+
+
+class ErrorWrapperMiddleware:
+    """
+    Catch unhandled exceptions and answer with a canned 500 response.
+
+    Registered as the outermost user middleware in place of an
+    `@app.exception_handler(Exception)`, so an error costs one log record and
+    two `send` calls instead of a trip through Starlette's exception
+    handling. On the happy path it only tracks whether the response started.
+    """
+
+    # Full tracebacks are logged for one in this many errors; the rest log
+    # only the type and message so an error storm can't flood the log sink
+    TRACEBACK_SAMPLE_RATE = 50
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._error_count = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if logger.isEnabledFor(logging.ERROR):
+                self._log_exception(scope, exc)
+
+            # Too late to replace a response that is already on the wire
+            if response_started:
+                raise
+
+            body = _error_body()
+            headers = [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ]
+            await send({"type": "http.response.start", "status": 500, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+    def _log_exception(self, scope: Scope, exc: Exception) -> None:
+        """Log an unhandled exception as a single structured record."""
+        # Built from plain attributes only, so nothing here can recurse into Rich
+        try:
+            exc_type, exc_message = type(exc).__name__, str(exc)[:500]
+        except Exception:
+            exc_info = safe_format_exception(exc)
+            exc_type, exc_message = exc_info["type"], exc_info["message"]
+
+        record = {
+            "exc_type": exc_type,
+            "exc_message": exc_message,
+            "path": scope.get("path", "unknown"),
+            "method": scope.get("method", "unknown"),
+        }
+
+        self._error_count += 1
+        logger.error(
+            "Unhandled exception: %s: %s (%s %s)",
+            exc_type, exc_message, record["method"], record["path"],
+            exc_info=exc if self._error_count % self.TRACEBACK_SAMPLE_RATE == 1 else None,
+            extra=record,
+        )
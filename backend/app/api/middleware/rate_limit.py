@@ -2,27 +2,71 @@
 Rate limiting middleware for FastAPI.
 """
 
-import asyncio
 import logging
 import time
-from typing import Dict, Optional
+from typing import Dict, Tuple
 
 import redis.asyncio as redis
-from fastapi import HTTPException, Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.api.middleware.asgi import get_client_ip, get_header, send_json_response
 from app.core.config import settings
 from app.core.logging import log_security_event
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using Redis for distributed rate limiting."""
+async def create_redis_client() -> redis.Redis:
+    """
+    Create the shared Redis client used for rate limiting.
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.redis_client: Optional[redis.Redis] = None
+    Called once from the application lifespan so every request (and every
+    worker) counts against the same Redis keys. The client is returned even
+    if Redis is unreachable at startup: it connects lazily on each command,
+    so limiting resumes once Redis is back, and requests fail open meanwhile.
+    """
+    client = redis.from_url(
+        settings.REDIS_URL,
+        socket_connect_timeout=5,
+        socket_timeout=5,
+        retry_on_timeout=True,
+        health_check_interval=30,
+    )
+    try:
+        await client.ping()
+        logger.debug("Redis connection established for rate limiting")
+    except Exception as e:
+        logger.warning(f"Redis unavailable for rate limiting, will retry per request: {e}")
+    return client
+
+
+class RateLimitMiddleware:
+    """
+    Rate limiting middleware using Redis for distributed rate limiting.
+    
+    Implemented as plain ASGI; the rate limit headers are added by wrapping
+    `send` instead of buffering the response through BaseHTTPMiddleware.
+    The Redis client is read from `app.state.redis` (set in the lifespan).
+    """
+    
+    # Exempt paths from rate limiting (probes don't consume budget or a
+    # Redis round trip)
+    EXEMPT_PATHS = frozenset({
+        "/health",
+        "/",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+        "/api/v1/health/supabase",
+    })
+    
+    # OAuth URL generator; like AuthMiddleware, only its GET is exempt
+    OAUTH_URL_PATH = "/api/v1/shopify/oauth/authorize"
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.requests_per_minute = settings.RATE_LIMIT_REQUESTS_PER_MINUTE
         self.burst_capacity = settings.RATE_LIMIT_BURST
         
@@ -33,161 +77,102 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             "/api/v1/video/generate": {"requests": 3, "window": 300},  # 3 per 5 minutes for video
         }
         
-        # Exempt paths from rate limiting
-        self.exempt_paths = {
-            "/health",
-            "/",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-        }
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with rate limiting."""
-        
-        # Skip rate limiting for exempt paths
-        if request.url.path in self.exempt_paths:
-            return await call_next(request)
-        
-        # Skip for OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        method = scope["method"]
+        redis_client = getattr(scope["app"].state, "redis", None)
+        
+        # Skip rate limiting for exempt paths, OPTIONS requests (CORS preflight),
+        # the GET OAuth URL generator and when no Redis client was created
+        if (
+            path in self.EXEMPT_PATHS
+            or method == "OPTIONS"
+            or (method == "GET" and path == self.OAUTH_URL_PATH)
+            or redis_client is None
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        # Get client identifier and rate limit configuration for this path
+        client_id = self._get_client_identifier(scope)
+        rate_config = self._get_rate_config(path)
+        requests_limit = rate_config["requests"]
+        window_seconds = rate_config["window"]
         
         try:
-            # Initialize Redis client if not already done
-            if self.redis_client is None:
-                await self._init_redis()
-            
-            # Get client identifier
-            client_id = self._get_client_identifier(request)
-            
-            # Check rate limit
-            allowed = await self._check_rate_limit(request, client_id)
-            
-            if not allowed:
-                log_security_event(
-                    "rate_limit_exceeded",
-                    ip_address=self._get_client_ip(request),
-                    user_agent=request.headers.get("user-agent"),
-                    path=request.url.path,
-                    client_id=client_id
-                )
-                
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Rate limit exceeded. Please try again later.",
-                    headers={
-                        "Retry-After": "60",
-                        "X-RateLimit-Limit": str(self.requests_per_minute),
-                        "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str(int(time.time()) + 60),
-                    }
-                )
-            
-        except HTTPException:
-            raise
+            count, reset_at = await self._increment_window(
+                redis_client, f"{client_id}:{path}:{method}", window_seconds
+            )
         except Exception as e:
             logger.error(f"Rate limiting error: {e}")
             # Continue without rate limiting if Redis is unavailable
-        
-        response = await call_next(request)
-        
-        # Add rate limit headers to response
-        try:
-            remaining = await self._get_remaining_requests(request, client_id)
-            response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Reset"] = str(int(time.time()) + 60)
-        except Exception as e:
-            logger.debug(f"Failed to add rate limit headers: {e}")
-        
-        return response
-    
-    async def _init_redis(self):
-        """Initialize Redis connection."""
-        try:
-            self.redis_client = redis.from_url(
-                settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True,
-                health_check_interval=30,
+            await self.app(scope, receive, send)
+            return
+        
+        if count > requests_limit:
+            log_security_event(
+                "rate_limit_exceeded",
+                ip_address=get_client_ip(scope),
+                user_agent=get_header(scope, b"user-agent"),
+                path=path,
+                client_id=client_id
             )
             
-            # Test connection
-            await self.redis_client.ping()
-            logger.debug("Redis connection established for rate limiting")
-            
-        except Exception as e:
-            logger.warning(f"Redis unavailable for rate limiting: {e}")
-            self.redis_client = None
-    
-    async def _check_rate_limit(self, request: Request, client_id: str) -> bool:
-        """Check if request is within rate limits."""
-        if self.redis_client is None:
-            return True  # Allow if Redis is unavailable
-        
-        # Get rate limit configuration for this path
-        rate_config = self._get_rate_config(request.url.path)
-        requests_limit = rate_config["requests"]
-        window_seconds = rate_config["window"]
+            await send_json_response(
+                send,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                {"detail": "Rate limit exceeded. Please try again later."},
+                headers={
+                    "Retry-After": str(max(1, reset_at - int(time.time()))),
+                    "X-RateLimit-Limit": str(requests_limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(reset_at),
+                }
+            )
+            return
         
-        # Use sliding window rate limiting
-        now = time.time()
-        window_start = now - window_seconds
+        rate_limit_headers = {
+            "X-RateLimit-Limit": str(requests_limit),
+            "X-RateLimit-Remaining": str(requests_limit - count),
+            "X-RateLimit-Reset": str(reset_at),
+        }
         
-        # Redis key for this client and endpoint
-        key = f"rate_limit:{client_id}:{request.url.path}:{request.method}"
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            # Add rate limit headers to response
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(rate_limit_headers)
+            await send(message)
         
-        try:
-            # Use Redis pipeline for atomic operations
-            pipe = self.redis_client.pipeline()
-            
-            # Remove old entries outside the window
-            pipe.zremrangebyscore(key, 0, window_start)
-            
-            # Count current requests in window
-            pipe.zcard(key)
-            
-            # Add current request
-            pipe.zadd(key, {str(now): now})
-            
-            # Set expiration
-            pipe.expire(key, window_seconds + 1)
-            
-            results = await pipe.execute()
-            current_requests = results[1]
-            
-            # Check if within limit
-            return current_requests < requests_limit
-            
-        except Exception as e:
-            logger.debug(f"Rate limit check failed: {e}")
-            return True  # Allow if check fails
+        await self.app(scope, receive, send_with_rate_limit_headers)
     
-    async def _get_remaining_requests(self, request: Request, client_id: str) -> int:
-        """Get remaining requests for client."""
-        if self.redis_client is None:
-            return self.requests_per_minute
-        
-        rate_config = self._get_rate_config(request.url.path)
-        requests_limit = rate_config["requests"]
-        window_seconds = rate_config["window"]
-        
-        now = time.time()
-        window_start = now - window_seconds
-        
-        key = f"rate_limit:{client_id}:{request.url.path}:{request.method}"
-        
-        try:
-            # Count current requests in window
-            current_requests = await self.redis_client.zcount(key, window_start, now)
-            return max(0, requests_limit - current_requests)
-        except Exception as e:
-            logger.debug(f"Failed to get remaining requests: {e}")
-            return requests_limit
+    async def _increment_window(
+        self,
+        redis_client: redis.Redis,
+        key_suffix: str,
+        window_seconds: int
+    ) -> Tuple[int, int]:
+        """
+        Count this request in the client's current fixed window.
+        
+        INCR + EXPIRE go out as one pipeline, so each request costs a single
+        Redis round trip. Returns the request count so far in the window and
+        the epoch second at which the window resets.
+        """
+        window = int(time.time()) // window_seconds
+        key = f"rl:{key_suffix}:{window}"
+        
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.expire(key, window_seconds)
+        count, _ = await pipe.execute()
+        
+        return count, (window + 1) * window_seconds
     
     def _get_rate_config(self, path: str) -> Dict[str, int]:
         """Get rate limit configuration for path."""
@@ -203,96 +188,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Default rate limit
         return {"requests": self.requests_per_minute, "window": 60}
     
-    def _get_client_identifier(self, request: Request) -> str:
+    def _get_client_identifier(self, scope: Scope) -> str:
         """Get unique identifier for client."""
         # Use user ID if authenticated
-        if hasattr(request.state, "user_id"):
-            return f"user:{request.state.user_id}"
+        user_id = scope.get("state", {}).get("user_id")
+        if user_id is not None:
+            return f"user:{user_id}"
         
         # Use IP address for unauthenticated requests
-        ip = self._get_client_ip(request)
+        ip = get_client_ip(scope)
         return f"ip:{ip}"
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Get client IP address from request."""
-        # Check for forwarded headers (when behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # Fallback to direct client IP
-        return request.client.host if request.client else "unknown"
-
-
-class InMemoryRateLimiter:
-    """In-memory rate limiter fallback when Redis is unavailable."""
-    
-    def __init__(self):
-        self.requests: Dict[str, list] = {}
-        self.lock = asyncio.Lock()
-    
-    async def check_rate_limit(
-        self,
-        client_id: str,
-        requests_limit: int,
-        window_seconds: int
-    ) -> bool:
-        """Check rate limit using in-memory storage."""
-        async with self.lock:
-            now = time.time()
-            window_start = now - window_seconds
-            
-            # Get or create request list for client
-            if client_id not in self.requests:
-                self.requests[client_id] = []
-            
-            client_requests = self.requests[client_id]
-            
-            # Remove old requests outside window
-            self.requests[client_id] = [
-                req_time for req_time in client_requests
-                if req_time > window_start
-            ]
-            
-            # Check if within limit
-            if len(self.requests[client_id]) >= requests_limit:
-                return False
-            
-            # Add current request
-            self.requests[client_id].append(now)
-            return True
-    
-    async def cleanup_old_entries(self):
-        """Clean up old entries to prevent memory leaks."""
-        async with self.lock:
-            now = time.time()
-            cutoff = now - 3600  # Remove entries older than 1 hour
-            
-            for client_id in list(self.requests.keys()):
-                self.requests[client_id] = [
-                    req_time for req_time in self.requests[client_id]
-                    if req_time > cutoff
-                ]
-                
-                # Remove empty lists
-                if not self.requests[client_id]:
-                    del self.requests[client_id]
-
-
-# Global in-memory rate limiter instance
-memory_rate_limiter = InMemoryRateLimiter()
-
-
-async def cleanup_rate_limiter():
-    """Background task to cleanup old rate limiter entries."""
-    while True:
-        try:
-            await memory_rate_limiter.cleanup_old_entries()
-            await asyncio.sleep(300)  # Cleanup every 5 minutes
-        except Exception as e:
-            logger.error(f"Rate limiter cleanup error: {e}")
-            await asyncio.sleep(60)  # Retry after 1 minute on error
\ No newline at end of file
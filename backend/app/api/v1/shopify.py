@@ -25,7 +25,7 @@ from app.models.shopify import (
     ShopifyWebhookRequest,
 )
 from app.models.auth import ErrorResponse
-from app.services.shopify_service import get_shopify_service
+from app.services.shopify_service import build_shopify_oauth_url, get_shopify_service
 
 logger = logging.getLogger(__name__)
 
@@ -43,29 +43,13 @@ async def generate_oauth_url_get(shop: str, redirect_uri: Optional[str] = None):
     """Generate Shopify OAuth authorization URL via GET request (for testing)."""
     
     try:
-        from app.core.config import settings
-        from urllib.parse import urlencode
-        
         # Generate state parameter for security (using test user for GET requests)
         state = f"test_user:127.0.0.1"
         
         # Generate OAuth URL manually without service dependency
         final_redirect_uri = redirect_uri or "http://localhost:8000/api/v1/shopify/oauth/callback"
         
-        if not settings.SHOPIFY_CLIENT_ID:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Shopify client ID not configured"
-            )
-        
-        params = {
-            "client_id": settings.SHOPIFY_CLIENT_ID,
-            "scope": ",".join(settings.SHOPIFY_SCOPES),
-            "redirect_uri": final_redirect_uri,
-            "state": state
-        }
-        
-        oauth_url = f"https://{shop}/admin/oauth/authorize?{urlencode(params)}"
+        oauth_url = build_shopify_oauth_url(shop, final_redirect_uri, state)
         
         return {
             "oauth_url": oauth_url,
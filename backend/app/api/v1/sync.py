@@ -24,7 +24,7 @@ from app.models.sync import (
     SyncStatus,
     TrendsSyncResult,
 )
-from app.services.shopify_service import ShopifyApiClient
+from app.services.shopify_service import SKU_CLEAN_TABLE, ShopifyApiClient
 
 logger = logging.getLogger(__name__)
 
@@ -80,8 +80,9 @@ async def perform_complete_sync(shop_id: int, sync_job_id: int, full_sync: bool
                 try:
                     for variant in product.get('variants', []):
                         # Clean SKU code
+                        sku_was_generated = not variant.get('sku')
                         sku_code = variant.get('sku') or f"SHOPIFY-{product['id']}-{variant['id']}"
-                        sku_code = sku_code.replace('\n', '').replace('\r', '').strip()
+                        sku_code = sku_code.translate(SKU_CLEAN_TABLE).strip()
                         
                         product_data = {
                             "shop_id": shop_id,
@@ -96,6 +97,14 @@ async def perform_complete_sync(shop_id: int, sync_job_id: int, full_sync: bool
                             "status": "active" if product.get('status') == 'active' else "archived"
                         }
                         
+                        if sku_was_generated:
+                            # Fallback SKUs are unique per variant, so skip the lookup
+                            supabase_client.table('products').upsert(
+                                product_data, on_conflict='shop_id,sku_code'
+                            ).execute()
+                            products_synced += 1
+                            continue
+                        
                         # Check if product exists
                         existing = supabase_client.table('products').select('sku_id').eq('shop_id', shop_id).eq('sku_code', sku_code).execute()
                         
@@ -130,27 +139,40 @@ async def perform_complete_sync(shop_id: int, sync_job_id: int, full_sync: bool
             base_date = datetime.utcnow() - timedelta(days=30)
             num_sales = random.randint(200, 500)
             
+            # Sample products by index; keep this on random.randrange rather
+            # than np.random.choice, which would copy the whole list of dicts
+            # into an array on every call
+            product_rows = products.data
+            num_products = len(product_rows)
+            
+            # Parse each product's price and SKU once, not once per sale
+            product_prices = [float(product['current_price']) for product in product_rows]
+            product_skus = [product['sku_code'] for product in product_rows]
+            
+            # Local aliases skip the module attribute lookups in the loop
+            randrange = random.randrange
+            randint = random.randint
+            uniform = random.uniform
+            
             for i in range(num_sales):
-                # Random date in last 30 days
-                days_ago = random.randint(0, 30)
-                hours_ago = random.randint(0, 23)
-                minutes_ago = random.randint(0, 59)
-                sold_at = base_date + timedelta(days=days_ago, hours=hours_ago, minutes=minutes_ago)
+                # Random minute in the 31-day window (same spread as separate
+                # day/hour/minute draws)
+                sold_at = base_date + timedelta(minutes=randrange(31 * 24 * 60))
                 
                 # Random product
-                product = random.choice(products.data)
+                product_index = randrange(num_products)
                 
                 # Random quantity and price variation
-                quantity = random.randint(1, 5)
-                base_price = float(product['current_price'])
-                price_variation = random.uniform(0.8, 1.2)
+                quantity = randint(1, 5)
+                base_price = product_prices[product_index]
+                price_variation = uniform(0.8, 1.2)
                 sold_price = round(base_price * price_variation, 2)
                 
                 sale_record = {
                     "shop_id": shop_id,
                     "shopify_order_id": 2000000 + (i // 3),
                     "shopify_line_item_id": 3000000 + i,
-                    "sku_code": product['sku_code'],
+                    "sku_code": product_skus[product_index],
                     "quantity_sold": quantity,
                     "sold_price": sold_price,
                     "sold_at": sold_at.isoformat()
@@ -6,13 +6,14 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from app.api.deps import get_current_user, get_optional_current_user
 from app.models.product import TrendUpdate
 from app.services.trend_analysis_service import TrendAnalysisService
 from app.services.azure_ai_service import AzureAIService
-from mock_trend_data import get_mock_trending_products
+from mock_trend_data import get_trending_sorted_json
 
 router = APIRouter()
 
@@ -399,25 +400,20 @@ async def get_trending_products(
                     }
                 })
         else:
-            # Return extensive mock trending products for demo
-            mock_products = get_mock_trending_products()
-            
-            # Filter by label if specified
-            if label:
-                trending_products = [p for p in mock_products if p["trend_data"]["label"] == label]
-            else:
-                trending_products = mock_products
-            
-            # Apply limit
-            trending_products = trending_products[:limit]
-        
-        return {
+            # Return extensive mock trending products for demo, filtered,
+            # sorted and limited the same way as the real insights. The
+            # records are pre-serialized JSON fragments.
+            trending_products = get_trending_sorted_json(label=label, top_k=limit)
+        
+        # Both branches hold only JSON-ready values, so encode directly with
+        # orjson instead of paying for FastAPI's jsonable_encoder pass
+        return ORJSONResponse({
             "shop_id": shop_id,
             "label_filter": label,
             "trending_products": trending_products,
             "count": len(trending_products),
             "limit": limit
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -20,6 +20,12 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = Field(default="development", description="Environment name")
     DEBUG: bool = Field(default=False, description="Debug mode")
     LOG_LEVEL: str = Field(default="WARNING", description="Logging level")
+    WEB_CONCURRENCY: int = Field(
+        default=2,
+        description="Uvicorn worker processes outside development; each opens its own "
+                    "database pool, so WEB_CONCURRENCY x DB_POOL_MAX must stay under "
+                    "the Postgres connection limit"
+    )
     
     # Security
     SECRET_KEY: str = Field(..., description="Application secret key")
@@ -32,6 +38,8 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = Field(..., description="Supabase project URL")
     SUPABASE_ANON_KEY: str = Field(..., description="Supabase anonymous key")
     SUPABASE_SERVICE_ROLE_KEY: str = Field(..., description="Supabase service role key")
+    DB_POOL_MIN: int = Field(default=5, description="Minimum database pool connections per worker")
+    DB_POOL_MAX: int = Field(default=20, description="Maximum database pool connections per worker")
     
     # Azure Configuration
     AZURE_KEY_VAULT_URL: Optional[str] = Field(default=None, description="Azure Key Vault URL")
@@ -61,6 +69,10 @@ class Settings(BaseSettings):
         default=["http://localhost:3000"],
         description="Allowed CORS origins"
     )
+    CORS_ENABLED: bool = Field(
+        default=True,
+        description="Install the CORS middleware (disable when a gateway handles CORS)"
+    )
     
     # Rate Limiting
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = Field(
@@ -3,9 +3,11 @@ Database configuration and connection management.
 """
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 import asyncpg
+import httpx
 from databases import Database
 from sqlalchemy import MetaData, create_engine
 from sqlalchemy.ext.declarative import declarative_base
@@ -17,22 +19,24 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 # Supabase client setup (lazy initialization)
-_supabase_client: Optional[Client] = None
-
+@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
-    """Get Supabase client with lazy initialization."""
-    global _supabase_client
-    if _supabase_client is None:
-        try:
-            _supabase_client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_SERVICE_ROLE_KEY
-            )
-            logger.info("Supabase client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Supabase client: {e}")
-            raise
-    return _supabase_client
+    """
+    Get the process-wide Supabase client.
+
+    The client is created on first use and cached, so every caller shares
+    the same PostgREST session and its pooled HTTP connections.
+    """
+    try:
+        supabase_client = create_client(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_SERVICE_ROLE_KEY
+        )
+        logger.info("Supabase client initialized successfully")
+        return supabase_client
+    except Exception as e:
+        logger.error(f"Failed to initialize Supabase client: {e}")
+        raise
 
 # SQLAlchemy setup (kept for compatibility)
 engine = create_engine(
@@ -53,15 +57,35 @@ metadata = MetaData()
 if settings.DATABASE_URL.startswith('sqlite'):
     database = Database(settings.DATABASE_URL)
 else:
-    # PostgreSQL connection with pooling
+    # PostgreSQL connection with pooling. Size DB_POOL_MAX to the expected
+    # concurrent requests per worker plus headroom; extra options are passed
+    # straight through to asyncpg.create_pool.
     database = Database(
         settings.DATABASE_URL,
-        min_size=5,
-        max_size=20,
+        min_size=settings.DB_POOL_MIN,
+        max_size=settings.DB_POOL_MAX,
         ssl="prefer" if settings.is_production else None,
+        max_inactive_connection_lifetime=300,
+        # No command_timeout: this pool also runs migrations and index builds
+        # through DatabaseManager.execute_script, which can take minutes
+        # Hot endpoints repeat the same SQL shapes, so keep more prepared statements
+        statement_cache_size=1024,
     )
 
 
+def get_pool_stats() -> Optional[Dict[str, int]]:
+    """Get size and idle counts of the shared database pool, if connected."""
+    # databases doesn't expose its asyncpg pool publicly
+    pool = getattr(getattr(database, "_backend", None), "_pool", None)
+    if not isinstance(pool, asyncpg.Pool):
+        return None
+    return {
+        "size": pool.get_size(),
+        "idle": pool.get_idle_size(),
+        "max_size": pool.get_max_size(),
+    }
+
+
 async def get_database() -> Database:
     """Get database connection."""
     return database
@@ -92,6 +116,30 @@ class DatabaseManager:
             logger.error(f"Failed to disconnect from database: {e}")
             raise
     
+    async def get_pool(self) -> asyncpg.Pool:
+        """Get the asyncpg pool, creating it on first use."""
+        if self._connection_pool is None:
+            try:
+                self._connection_pool = await asyncpg.create_pool(
+                    dsn=settings.DATABASE_URL,
+                    min_size=1,
+                    max_size=10,
+                    # Per-connection LRU of prepared statements keyed by SQL text,
+                    # so repeated sync queries skip parse/plan
+                    statement_cache_size=256,
+                )
+                logger.info("asyncpg pool created successfully")
+            except Exception as e:
+                logger.error(f"Failed to create asyncpg pool: {e}")
+                raise
+        return self._connection_pool
+    
+    async def close(self) -> None:
+        """Close the asyncpg pool if it was created."""
+        if self._connection_pool is not None:
+            await self._connection_pool.close()
+            self._connection_pool = None
+    
     async def execute_query(
         self,
         query: str,
@@ -107,6 +155,16 @@ class DatabaseManager:
             logger.error(f"Database query failed: {e}")
             raise
     
+    async def execute_script(self, script: str) -> None:
+        """Execute a multi-statement SQL script in a single round trip."""
+        try:
+            async with self.database.connection() as connection:
+                # asyncpg's simple query protocol accepts several statements at once
+                await connection.raw_connection.execute(script)
+        except Exception as e:
+            logger.error(f"Database script failed: {e}")
+            raise
+    
     async def fetch_one(
         self,
         query: str,
@@ -154,7 +212,27 @@ async def get_db_manager() -> DatabaseManager:
 
 
 # Database health check
-async def check_database_health() -> Dict[str, Any]:
+def create_supabase_http_client() -> httpx.AsyncClient:
+    """
+    Create a keep-alive HTTP client for Supabase's REST API.
+    
+    Created once in the application lifespan so repeated health probes reuse
+    the same TLS connection instead of blocking on the synchronous client.
+    """
+    return httpx.AsyncClient(
+        base_url=f"{settings.SUPABASE_URL}/rest/v1",
+        headers={
+            "apikey": settings.SUPABASE_SERVICE_ROLE_KEY,
+            "Authorization": f"Bearer {settings.SUPABASE_SERVICE_ROLE_KEY}",
+        },
+        timeout=2.0,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+
+
+async def check_database_health(
+    http_client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, Any]:
     """Check database connection health."""
     try:
         # Try direct database connection first
@@ -171,8 +249,12 @@ async def check_database_health() -> Dict[str, Any]:
         # Fallback to Supabase client
         try:
             # Test Supabase connection by querying a system table
-            supabase_client = get_supabase_client()
-            result = supabase_client.table('stores').select('id').limit(1).execute()
+            if http_client is not None:
+                response = await http_client.get("/stores", params={"select": "id", "limit": 1})
+                response.raise_for_status()
+            else:
+                supabase_client = get_supabase_client()
+                result = supabase_client.table('stores').select('id').limit(1).execute()
             return {
                 "status": "healthy",
                 "connected": True,
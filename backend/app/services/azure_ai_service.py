@@ -10,7 +10,6 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 from fastapi import HTTPException, status
-from openai import AzureOpenAI
 
 from app.core.config import settings
 from app.core.database import get_supabase_client
@@ -35,6 +34,9 @@ class AzureAIService(LoggerMixin):
         self.azure_client = None
         if self._is_azure_configured():
             try:
+                # Deferred so the openai SDK only loads when Azure is configured
+                from openai import AzureOpenAI
+                
                 self.azure_client = AzureOpenAI(
                     azure_endpoint=self.endpoint,
                     api_key=self.api_key,
@@ -7,7 +7,6 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import fal_client
 from fastapi import HTTPException, status
 
 from app.core.config import settings
@@ -34,6 +33,7 @@ class FALAIService(LoggerMixin):
             import os
             os.environ['FAL_KEY'] = self.fal_api_key
             # Also set the client API key directly
+            import fal_client
             fal_client.api_key = self.fal_api_key
             logger.info(f"FAL AI client configured successfully with key: {self.fal_api_key[:10]}...")
         else:
@@ -283,6 +283,9 @@ I recommend continuing your current strategy while keeping an eye on emerging tr
             
             fal_avatar_id = fal_avatar_mapping.get(avatar_id, "marcus_primary")
             
+            # Deferred so fal_client only loads when avatar generation is used
+            import fal_client
+            
             # Use submit instead of subscribe for better timeout handling
             handler = fal_client.submit(
                 "veed/avatars/text-to-video",
@@ -11,7 +11,7 @@ import os
 import time
 import traceback
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from urllib.parse import urlencode, urlparse
 
 import httpx
@@ -49,6 +49,33 @@ from app.models.shopify import (
 
 logger = logging.getLogger(__name__)
 
+# Static part of the Shopify OAuth query string; client_id and scopes only
+# change on redeploy, so they are encoded once at import
+_OAUTH_STATIC_QUERY: Optional[str] = (
+    urlencode({"client_id": settings.SHOPIFY_CLIENT_ID, "scope": settings.shopify_scope_string})
+    if settings.SHOPIFY_CLIENT_ID
+    else None
+)
+
+# Characters stripped from Shopify SKU codes; shared by every sync path so
+# they all store the same sku_code for a variant
+SKU_CLEAN_TABLE = str.maketrans('', '', '\n\r\t')
+
+
+def build_shopify_oauth_url(shop_domain: str, redirect_uri: str, state: Optional[str] = None) -> str:
+    """Build the Shopify OAuth authorize URL from the precomputed static query."""
+    if not _OAUTH_STATIC_QUERY:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Shopify client ID not configured"
+        )
+    
+    dynamic_params = {"redirect_uri": redirect_uri}
+    if state:
+        dynamic_params["state"] = state
+    
+    return f"https://{shop_domain}/admin/oauth/authorize?{_OAUTH_STATIC_QUERY}&{urlencode(dynamic_params)}"
+
 
 class ShopifyRateLimiter:
     """Rate limiter for Shopify API calls using leaky bucket algorithm."""
@@ -115,8 +142,15 @@ class ShopifyApiClient:
         self.access_token = access_token
         self.base_url = f"https://{shop_domain}/admin/api/{settings.SHOPIFY_API_VERSION}"
         self.rate_limiter = ShopifyRateLimiter()
+        # Keep-alive pool sized to Shopify's per-store concurrency so
+        # concurrent product/order fetches reuse TLS connections
         self.client = httpx.AsyncClient(
             timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=8,
+                max_keepalive_connections=8,
+                keepalive_expiry=60.0,
+            ),
             headers={
                 "X-Shopify-Access-Token": access_token,
                 "Content-Type": "application/json",
@@ -333,6 +367,29 @@ class ShopifyApiClient:
         response_data, _ = await self._make_request("GET", "/products.json", params=params)
         return response_data.get("products", [])
     
+    async def iter_products(
+        self,
+        page_size: int = 250,
+        published_status: str = "any"
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of products, paginating by ``since_id``."""
+        # Shopify caps pages at 250; a short page must be compared to the
+        # clamped size or pagination would stop after the first page
+        page_size = min(page_size, 250)
+        since_id = None
+        while True:
+            products = await self.get_products(
+                limit=page_size, since_id=since_id, published_status=published_status
+            )
+            if not products:
+                return
+            
+            yield products
+            
+            if len(products) < page_size:
+                return
+            since_id = products[-1]["id"]
+    
     async def get_product(self, product_id: int) -> Dict[str, Any]:
         """Get single product by ID."""
         response_data, _ = await self._make_request("GET", f"/products/{product_id}.json")
@@ -358,6 +415,33 @@ class ShopifyApiClient:
         response_data, _ = await self._make_request("GET", "/orders.json", params=params)
         return response_data.get("orders", [])
     
+    async def iter_orders(
+        self,
+        page_size: int = 250,
+        created_at_min: Optional[datetime] = None,
+        financial_status: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of orders, paginating by ``since_id``."""
+        # Shopify caps pages at 250; a short page must be compared to the
+        # clamped size or pagination would stop after the first page
+        page_size = min(page_size, 250)
+        since_id = None
+        while True:
+            orders = await self.get_orders(
+                limit=page_size,
+                since_id=since_id,
+                created_at_min=created_at_min,
+                financial_status=financial_status
+            )
+            if not orders:
+                return
+            
+            yield orders
+            
+            if len(orders) < page_size:
+                return
+            since_id = orders[-1]["id"]
+    
     async def get_inventory_levels(
         self,
         location_ids: Optional[List[int]] = None,
@@ -444,22 +528,7 @@ class ShopifyService:
         Returns:
             OAuth authorization URL
         """
-        if not settings.SHOPIFY_CLIENT_ID:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Shopify client ID not configured"
-            )
-        
-        params = {
-            "client_id": settings.SHOPIFY_CLIENT_ID,
-            "scope": settings.shopify_scope_string,
-            "redirect_uri": redirect_uri,
-        }
-        
-        if state:
-            params["state"] = state
-        
-        return f"https://{shop_domain}/admin/oauth/authorize?{urlencode(params)}"
+        return build_shopify_oauth_url(shop_domain, redirect_uri, state)
     
     async def exchange_oauth_code(
         self,
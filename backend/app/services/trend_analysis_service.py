@@ -9,11 +9,10 @@ import random
 import time
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import httpx
 from fastapi import HTTPException, status
-from pytrends.request import TrendReq
 
 from app.core.config import settings
 from app.core.database import get_supabase_client
@@ -26,6 +25,9 @@ from app.core.logging import (
 )
 from app.models.product import TrendUpdate
 
+if TYPE_CHECKING:
+    from pytrends.request import TrendReq
+
 
 logger = get_logger(__name__)
 
@@ -88,9 +90,12 @@ class GoogleTrendsClient:
         self._last_request_time = 0
         self._min_request_interval = 2.0  # Minimum 2 seconds between requests
     
-    def _get_pytrends(self) -> TrendReq:
+    def _get_pytrends(self) -> "TrendReq":
         """Get or create pytrends instance."""
         if self._pytrends is None:
+            # Deferred: pytrends pulls in pandas, which dominates import time
+            from pytrends.request import TrendReq
+            
             self._pytrends = TrendReq(
                 hl='en-US',
                 tz=360,
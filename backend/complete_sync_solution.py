@@ -13,7 +13,41 @@ backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
 from app.core.database import get_supabase_client
-from app.services.shopify_service import ShopifyApiClient
+from app.services.shopify_service import SKU_CLEAN_TABLE, ShopifyApiClient
+
+def create_orders_table():
+    """Create orders table if it doesn't exist"""
+    print("📋 Creating orders table...")
+    
+    supabase = get_supabase_client()
+    
+    create_orders_sql = """
+    CREATE TABLE IF NOT EXISTS orders (
+        id SERIAL PRIMARY KEY,
+        shop_id BIGINT NOT NULL,
+        shopify_order_id BIGINT NOT NULL,
+        order_number TEXT,
+        customer_email TEXT,
+        total_price DECIMAL(10,2),
+        subtotal_price DECIMAL(10,2),
+        total_tax DECIMAL(10,2),
+        currency TEXT DEFAULT 'USD',
+        financial_status TEXT,
+        fulfillment_status TEXT,
+        order_date TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        UNIQUE(shop_id, shopify_order_id)
+    );
+    """
+    
+    try:
+        supabase.rpc('exec_sql', {'sql': create_orders_sql}).execute()
+        print("✅ Orders table created/verified")
+        return True
+    except Exception as e:
+        print(f"⚠️  Could not create orders table: {e}")
+        return False
 
 def sync_everything_now(shop_id=4):
     """Sync products AND orders RIGHT NOW"""
@@ -53,41 +87,72 @@ def sync_everything_now(shop_id=4):
         
         async def sync_products_and_orders():
             async with ShopifyApiClient(store['shop_domain'], store['access_token']) as api_client:
+                batch_size = 500
                 
                 # ===== SYNC PRODUCTS =====
                 print("\n📦 SYNCING PRODUCTS...")
-                all_products = []
-                page = 1
+                total_products = 0
+                products_synced = 0
+                products_failed = 0
                 
-                while True:
-                    print(f"   Fetching products page {page}...")
-                    products = await api_client.get_products(limit=250)
-                    
-                    if not products:
-                        break
-                    
-                    all_products.extend(products)
-                    print(f"   Got {len(products)} products (total: {len(all_products)})")
-                    
-                    if len(products) < 250:
-                        break
-                    
-                    page += 1
+                # Rows keyed by SKU so a batch never touches the same row twice
+                product_batch = {}
                 
-                print(f"✅ Total products fetched: {len(all_products)}")
+                # A batch write runs in a worker thread while the next Shopify
+                # page is being fetched. At most one write is in flight: each
+                # flush waits for the previous write first, which bounds memory
+                # and keeps batches landing in order.
+                in_flight = []
                 
-                # Sync products to database
-                products_synced = 0
-                products_failed = 0
+                async def wait_for_write():
+                    if in_flight:
+                        await in_flight.pop()
+                
+                def upsert_products_one_by_one(rows):
+                    synced = failed = 0
+                    for row in rows:
+                        try:
+                            supabase.rpc('upsert_products', {'rows': [row]}).execute()
+                            synced += 1
+                        except Exception as e:
+                            print(f"   ❌ Failed to sync product {row['sku_code']}: {e}")
+                            failed += 1
+                    return synced, failed
                 
-                for product in all_products:
+                async def write_products(rows):
+                    # One server-side INSERT ... ON CONFLICT per batch
+                    # (see upsert_products_function.sql)
+                    nonlocal products_synced, products_failed
                     try:
+                        await asyncio.to_thread(
+                            supabase.rpc('upsert_products', {'rows': rows}).execute
+                        )
+                        products_synced += len(rows)
+                    except Exception as e:
+                        # One bad row fails the whole statement; retry the
+                        # batch row by row so the good rows still land
+                        print(f"   ⚠️ Products batch failed, retrying row by row: {e}")
+                        synced, failed = await asyncio.to_thread(upsert_products_one_by_one, rows)
+                        products_synced += synced
+                        products_failed += failed
+                
+                async def flush_products():
+                    rows = list(product_batch.values())
+                    product_batch.clear()
+                    await wait_for_write()
+                    in_flight.append(asyncio.create_task(write_products(rows)))
+                
+                async for products in api_client.iter_products(page_size=250):
+                    total_products += len(products)
+                    print(f"   Got {len(products)} products (total: {total_products})")
+                    
+                    for product in products:
                         for variant in product.get('variants', []):
                             # Clean SKU code (remove newlines and invalid chars)
                             sku_code = variant.get('sku') or f"SHOPIFY-{product['id']}-{variant['id']}"
-                            sku_code = sku_code.replace('\n', '').replace('\r', '').strip()
+                            sku_code = sku_code.translate(SKU_CLEAN_TABLE).strip()
                             
-                            product_data = {
+                            product_batch[sku_code] = {
                                 "shop_id": shop_id,
                                 "shopify_product_id": product['id'],
                                 "sku_code": sku_code,
@@ -100,22 +165,14 @@ def sync_everything_now(shop_id=4):
                                 "status": "active" if product.get('status') == 'active' else "archived"
                             }
                             
-                            # Check if product exists
-                            existing = supabase.table('products').select('sku_id').eq('shop_id', shop_id).eq('sku_code', sku_code).execute()
-                            
-                            if existing.data:
-                                # Update existing
-                                supabase.table('products').update(product_data).eq('sku_id', existing.data[0]['sku_id']).execute()
-                            else:
-                                # Create new
-                                supabase.table('products').insert(product_data).execute()
-                            
-                            products_synced += 1
-                            
-                    except Exception as e:
-                        print(f"   ❌ Failed to sync product {product.get('title', 'Unknown')}: {e}")
-                        products_failed += 1
+                            if len(product_batch) >= batch_size:
+                                await flush_products()
                 
+                if product_batch:
+                    await flush_products()
+                await wait_for_write()
+                
+                print(f"✅ Total products fetched: {total_products}")
                 print(f"✅ Products synced: {products_synced}, Failed: {products_failed}")
                 
                 # ===== SYNC ORDERS =====
@@ -123,67 +180,40 @@ def sync_everything_now(shop_id=4):
                 
                 # Get orders from last 30 days
                 since_date = datetime.utcnow() - timedelta(days=30)
-                all_orders = []
-                page = 1
-                
-                while True:
-                    print(f"   Fetching orders page {page}...")
-                    orders = await api_client.get_orders(
-                        limit=250,
-                        created_at_min=since_date,
-                        financial_status="paid"  # Only paid orders
-                    )
-                    
-                    if not orders:
-                        break
-                    
-                    all_orders.extend(orders)
-                    print(f"   Got {len(orders)} orders (total: {len(all_orders)})")
-                    
-                    if len(orders) < 250:
-                        break
-                    
-                    page += 1
-                
-                print(f"✅ Total orders fetched: {len(all_orders)}")
+                total_orders = 0
+                orders_synced = 0
+                orders_failed = 0
+                order_batch = []
                 
-                # Check if orders table exists, if not create it
-                try:
-                    supabase.table('orders').select('id').limit(1).execute()
-                except:
-                    print("📋 Creating orders table...")
-                    create_orders_sql = """
-                    CREATE TABLE IF NOT EXISTS orders (
-                        id SERIAL PRIMARY KEY,
-                        shop_id BIGINT NOT NULL,
-                        shopify_order_id BIGINT NOT NULL,
-                        order_number TEXT,
-                        customer_email TEXT,
-                        total_price DECIMAL(10,2),
-                        subtotal_price DECIMAL(10,2),
-                        total_tax DECIMAL(10,2),
-                        currency TEXT DEFAULT 'USD',
-                        financial_status TEXT,
-                        fulfillment_status TEXT,
-                        order_date TIMESTAMP WITH TIME ZONE,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        UNIQUE(shop_id, shopify_order_id)
-                    );
-                    """
+                async def write_orders(rows):
+                    nonlocal orders_synced, orders_failed
                     try:
-                        supabase.rpc('exec_sql', {'sql': create_orders_sql}).execute()
-                        print("✅ Orders table created")
+                        await asyncio.to_thread(
+                            supabase.table('orders').upsert(
+                                rows, on_conflict='shop_id,shopify_order_id'
+                            ).execute
+                        )
+                        orders_synced += len(rows)
                     except Exception as e:
-                        print(f"⚠️  Could not create orders table: {e}")
+                        print(f"   ❌ Failed to sync orders batch: {e}")
+                        orders_failed += len(rows)
                 
-                # Sync orders to database
-                orders_synced = 0
-                orders_failed = 0
+                async def flush_orders():
+                    rows = order_batch.copy()
+                    order_batch.clear()
+                    await wait_for_write()
+                    in_flight.append(asyncio.create_task(write_orders(rows)))
                 
-                for order in all_orders:
-                    try:
-                        order_data = {
+                async for orders in api_client.iter_orders(
+                    page_size=250,
+                    created_at_min=since_date,
+                    financial_status="paid"  # Only paid orders
+                ):
+                    total_orders += len(orders)
+                    print(f"   Got {len(orders)} orders (total: {total_orders})")
+                    
+                    for order in orders:
+                        order_batch.append({
                             "shop_id": shop_id,
                             "shopify_order_id": order['id'],
                             "order_number": order.get('order_number'),
@@ -195,24 +225,16 @@ def sync_everything_now(shop_id=4):
                             "financial_status": order.get('financial_status'),
                             "fulfillment_status": order.get('fulfillment_status'),
                             "order_date": order.get('created_at')
-                        }
-                        
-                        # Check if order exists
-                        existing = supabase.table('orders').select('id').eq('shop_id', shop_id).eq('shopify_order_id', order['id']).execute()
+                        })
                         
-                        if existing.data:
-                            # Update existing
-                            supabase.table('orders').update(order_data).eq('id', existing.data[0]['id']).execute()
-                        else:
-                            # Create new
-                            supabase.table('orders').insert(order_data).execute()
-                        
-                        orders_synced += 1
-                        
-                    except Exception as e:
-                        print(f"   ❌ Failed to sync order {order.get('order_number', 'Unknown')}: {e}")
-                        orders_failed += 1
+                        if len(order_batch) >= batch_size:
+                            await flush_orders()
                 
+                if order_batch:
+                    await flush_orders()
+                await wait_for_write()
+                
+                print(f"✅ Total orders fetched: {total_orders}")
                 print(f"✅ Orders synced: {orders_synced}, Failed: {orders_failed}")
                 
                 return {
@@ -220,8 +242,8 @@ def sync_everything_now(shop_id=4):
                     "products_failed": products_failed,
                     "orders_synced": orders_synced,
                     "orders_failed": orders_failed,
-                    "total_products": len(all_products),
-                    "total_orders": len(all_orders)
+                    "total_products": total_products,
+                    "total_orders": total_orders
                 }
         
         # Run the complete sync
@@ -260,6 +282,9 @@ if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()
     
+    # Idempotent DDL runs once per process, not on every sync
+    create_orders_table()
+    
     success = sync_everything_now()
     if success:
         print("\n🚀 YOUR HACKATHON DATA IS READY!")
@@ -4,10 +4,13 @@ CREATE MOCK ORDERS - Get your dashboard working NOW!
 This creates realistic order data so your dashboard works immediately.
 """
 
+import heapq
 import sys
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timedelta
-import random
+
+import numpy as np
 
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent
@@ -73,30 +76,42 @@ def create_mock_sales(shop_id=4):
         "Kevin White", "Michelle Thompson", "Daniel Rodriguez", "Ashley Clark", "James Lewis"
     ]
     
+    customer_emails = [f"{name.lower().replace(' ', '.')}@example.com" for name in customer_names]
+    product_prices = np.array([float(product['current_price']) for product in products.data])
+    
     financial_statuses = ["paid", "pending", "refunded"]
     fulfillment_statuses = ["fulfilled", "partial", "unfulfilled"]
     
-    for i in range(100):  # Create 100 mock sales
+    # Generate all numeric columns for the batch in one shot
+    num_sales = 100  # Create 100 mock sales
+    rng = np.random.default_rng()
+    days_ago = rng.integers(0, 31, size=num_sales)
+    hours = rng.integers(0, 24, size=num_sales)
+    minutes = rng.integers(0, 60, size=num_sales)
+    customer_idx = rng.integers(0, len(customer_names), size=num_sales)
+    num_items = rng.integers(1, 5, size=num_sales)
+    financial_idx = rng.integers(0, len(financial_statuses), size=num_sales)
+    fulfillment_idx = rng.integers(0, len(fulfillment_statuses), size=num_sales)
+    
+    # Per-order product sampling stays a Python loop over index arrays
+    subtotals = np.zeros(num_sales)
+    for i in range(num_sales):
+        # Random products and quantities
+        selected_idx = rng.choice(len(product_prices), size=min(int(num_items[i]), len(product_prices)), replace=False)
+        quantities = rng.integers(1, 4, size=len(selected_idx))
+        subtotals[i] = product_prices[selected_idx] @ quantities
+    
+    tax_rate = 0.08  # 8% tax
+    total_taxes = np.round(subtotals * tax_rate, 2)
+    total_prices = np.round(subtotals + total_taxes, 2)
+    
+    for i in range(num_sales):
         # Random date in last 30 days
-        days_ago = random.randint(0, 30)
-        order_date = base_date + timedelta(days=days_ago, hours=random.randint(0, 23), minutes=random.randint(0, 59))
+        order_date = base_date + timedelta(days=int(days_ago[i]), hours=int(hours[i]), minutes=int(minutes[i]))
         
         # Random customer
-        customer_name = random.choice(customer_names)
-        customer_email = f"{customer_name.lower().replace(' ', '.')}@example.com"
-        
-        # Random products and quantities
-        num_items = random.randint(1, 4)
-        selected_products = random.sample(products.data, min(num_items, len(products.data)))
-        
-        subtotal = 0
-        for product in selected_products:
-            quantity = random.randint(1, 3)
-            subtotal += float(product['current_price']) * quantity
-        
-        tax_rate = 0.08  # 8% tax
-        total_tax = round(subtotal * tax_rate, 2)
-        total_price = round(subtotal + total_tax, 2)
+        customer_name = customer_names[customer_idx[i]]
+        customer_email = customer_emails[customer_idx[i]]
         
         mock_sale = {
             "shop_id": shop_id,
@@ -104,12 +119,12 @@ def create_mock_sales(shop_id=4):
             "order_number": f"#{1001 + i}",
             "customer_email": customer_email,
             "customer_name": customer_name,
-            "total_price": total_price,
-            "subtotal_price": subtotal,
-            "total_tax": total_tax,
+            "total_price": float(total_prices[i]),
+            "subtotal_price": float(subtotals[i]),
+            "total_tax": float(total_taxes[i]),
             "currency": "USD",
-            "financial_status": random.choice(financial_statuses),
-            "fulfillment_status": random.choice(fulfillment_statuses),
+            "financial_status": financial_statuses[financial_idx[i]],
+            "fulfillment_status": fulfillment_statuses[fulfillment_idx[i]],
             "order_date": order_date.isoformat()
         }
         
@@ -128,9 +143,10 @@ def create_mock_sales(shop_id=4):
             batch = mock_sales[i:i + batch_size]
             result = supabase.table('sales').insert(batch).execute()
             sales_created += len(result.data) if result.data else 0
-            print(f"   Created batch {i//batch_size + 1}: {len(batch)} sales")
         
-        print(f"✅ Created {sales_created} mock sales")
+        # One summary line instead of a flushed print per batch
+        num_batches = -(-len(mock_sales) // batch_size)
+        print(f"✅ Created {sales_created} mock sales in {num_batches} batches")
         
         # Show summary statistics
         print(f"\n📊 SALES SUMMARY:")
@@ -140,16 +156,17 @@ def create_mock_sales(shop_id=4):
         print(f"   💰 Total Revenue: ${total_revenue:,.2f}")
         
         # Sales by status
-        paid_sales = len([s for s in mock_sales if s['financial_status'] == 'paid'])
-        pending_sales = len([s for s in mock_sales if s['financial_status'] == 'pending'])
-        refunded_sales = len([s for s in mock_sales if s['financial_status'] == 'refunded'])
+        status_counts = Counter(s['financial_status'] for s in mock_sales)
+        paid_sales = status_counts['paid']
+        pending_sales = status_counts['pending']
+        refunded_sales = status_counts['refunded']
         
         print(f"   📈 Paid Sales: {paid_sales}")
         print(f"   ⏳ Pending Sales: {pending_sales}")
         print(f"   🔄 Refunded Sales: {refunded_sales}")
         
         # Recent sales
-        recent_sales = sorted(mock_sales, key=lambda x: x['order_date'], reverse=True)[:5]
+        recent_sales = heapq.nlargest(5, mock_sales, key=lambda x: x['order_date'])
         print(f"\n📋 Recent Sales:")
         for sale in recent_sales:
             print(f"   {sale['order_number']}: {sale['customer_name']} - ${sale['total_price']}")
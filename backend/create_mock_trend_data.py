@@ -5,6 +5,7 @@ Create mock trend data for demo purposes
 
 import asyncio
 import random
+import numpy as np
 from datetime import datetime, timedelta
 from app.core.database import SessionLocal
 from app.models.product import Product
@@ -87,32 +88,29 @@ MOCK_PRODUCTS = [
     }
 ]
 
-def generate_trend_label():
-    """Generate random trend label based on weights"""
-    labels = ["Hot", "Rising", "Steady", "Declining"]
-    weights = [0.2, 0.3, 0.4, 0.1]  # Hot: 20%, Rising: 30%, Steady: 40%, Declining: 10%
-    return random.choices(labels, weights=weights)[0]
+TREND_LABELS = np.array(["Hot", "Rising", "Steady", "Declining"])
+TREND_LABEL_WEIGHTS = [0.2, 0.3, 0.4, 0.1]  # Hot: 20%, Rising: 30%, Steady: 40%, Declining: 10%
 
-def generate_trend_scores(label):
-    """Generate realistic trend scores based on label"""
-    if label == "Hot":
-        google_trend = random.uniform(80, 100)
-        social_score = random.uniform(85, 100)
-        final_score = random.uniform(85, 100)
-    elif label == "Rising":
-        google_trend = random.uniform(60, 85)
-        social_score = random.uniform(65, 90)
-        final_score = random.uniform(65, 85)
-    elif label == "Steady":
-        google_trend = random.uniform(40, 70)
-        social_score = random.uniform(45, 75)
-        final_score = random.uniform(45, 70)
-    else:  # Declining
-        google_trend = random.uniform(10, 45)
-        social_score = random.uniform(15, 50)
-        final_score = random.uniform(15, 45)
+# Per-label (low, high) bounds for google trend, social score and final score,
+# in the same order as TREND_LABELS
+TREND_SCORE_BOUNDS = np.array([
+    [(80, 100), (85, 100), (85, 100)],  # Hot
+    [(60, 85), (65, 90), (65, 85)],     # Rising
+    [(40, 70), (45, 75), (45, 70)],     # Steady
+    [(10, 45), (15, 50), (15, 45)],     # Declining
+])
+
+def generate_trend_data(count, rng=None):
+    """Generate trend labels and realistic scores for `count` products at once.
+
+    Returns a tuple of (labels, google_trend, social_score, final_score) arrays.
+    """
+    rng = rng or np.random.default_rng()
+    label_idx = rng.choice(len(TREND_LABELS), size=count, p=TREND_LABEL_WEIGHTS)
+    bounds = TREND_SCORE_BOUNDS[label_idx]  # shape (count, 3, 2)
+    scores = rng.uniform(bounds[..., 0], bounds[..., 1])
     
-    return google_trend, social_score, final_score
+    return TREND_LABELS[label_idx], scores[:, 0], scores[:, 1], scores[:, 2]
 
 async def create_mock_data():
     """Create mock products and trend data"""
@@ -130,31 +128,32 @@ async def create_mock_data():
         
         # Create mock products
         print("📦 Creating mock products...")
-        for product_data in MOCK_PRODUCTS:
-            product = Product(**product_data)
-            db.add(product)
-        
+        db.bulk_insert_mappings(Product, MOCK_PRODUCTS)
         db.commit()
         print(f"✅ Created {len(MOCK_PRODUCTS)} mock products")
         
         # Create trend analysis data for each product
         print("📊 Creating trend analysis data...")
-        created_count = 0
+        trend_rows = []
+        now = datetime.utcnow()
+        labels, google_trends, social_scores, final_scores = generate_trend_data(len(MOCK_PRODUCTS))
         
-        for product_data in MOCK_PRODUCTS:
+        for i, product_data in enumerate(MOCK_PRODUCTS):
             sku_code = product_data["sku_code"]
-            label = generate_trend_label()
-            google_trend, social_score, final_score = generate_trend_scores(label)
+            label = str(labels[i])
+            google_trend = float(google_trends[i])
+            social_score = float(social_scores[i])
+            final_score = float(final_scores[i])
             
-            # Create trend analysis record
-            trend_analysis = TrendAnalysis(
-                sku_code=sku_code,
-                shop_id=1,
-                google_trend_index=google_trend,
-                social_score=social_score,
-                final_score=final_score,
-                label=label,
-                analysis_data={
+            # Build trend analysis row
+            trend_rows.append({
+                "sku_code": sku_code,
+                "shop_id": 1,
+                "google_trend_index": google_trend,
+                "social_score": social_score,
+                "final_score": final_score,
+                "label": label,
+                "analysis_data": {
                     "google_trends": {
                         "interest_over_time": [
                             {"date": (datetime.now() - timedelta(days=i)).isoformat(), 
@@ -178,14 +177,14 @@ async def create_mock_data():
                         "demand_forecast": label.lower()
                     }
                 },
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            
-            db.add(trend_analysis)
-            created_count += 1
+                "created_at": now,
+                "updated_at": now
+            })
         
+        # Single multi-row INSERT, bypassing per-instance ORM bookkeeping
+        db.bulk_insert_mappings(TrendAnalysis, trend_rows)
         db.commit()
+        created_count = len(trend_rows)
         print(f"✅ Created {created_count} trend analysis records")
         
         # Print summary
@@ -8,7 +8,7 @@ from app.core.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
-async def create_video_tables():
+async def create_video_tables(include_secondary_indexes: bool = True):
     """Create video generation tables."""
     
     db_manager = DatabaseManager()
@@ -68,40 +68,62 @@ async def create_video_tables():
         )
         """
         
-        # Execute table creation queries
-        queries = [
-            ("video_jobs", create_video_jobs_query),
-            ("video_scripts", create_video_scripts_query),
-            ("generated_videos", create_generated_videos_query)
+        # Create indexes for better performance. CONCURRENTLY avoids blocking
+        # writes when the tables already hold data.
+        index_queries = [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_jobs_status ON video_jobs(status)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_jobs_shop_id ON video_jobs(shop_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_scripts_job_id ON video_scripts(job_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_scripts_shop_id ON video_scripts(shop_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_generated_videos_job_id ON generated_videos(job_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_generated_videos_shop_id ON generated_videos(shop_id)",
         ]
         
-        for table_name, query in queries:
-            try:
-                await db_manager.execute_query(query)
-                logger.info(f"✅ Created/verified table: {table_name}")
-            except Exception as e:
-                logger.error(f"❌ Failed to create table {table_name}: {e}")
-                raise
+        # Reporting/sorting indexes that the job pipeline doesn't depend on
+        if include_secondary_indexes:
+            index_queries += [
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_jobs_user_id ON video_jobs(user_id)",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_jobs_created_at ON video_jobs(created_at)",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_generated_videos_generated_at ON generated_videos(generated_at)",
+            ]
         
-        # Create indexes for better performance
-        index_queries = [
-            "CREATE INDEX IF NOT EXISTS idx_video_jobs_status ON video_jobs(status)",
-            "CREATE INDEX IF NOT EXISTS idx_video_jobs_shop_id ON video_jobs(shop_id)",
-            "CREATE INDEX IF NOT EXISTS idx_video_jobs_user_id ON video_jobs(user_id)",
-            "CREATE INDEX IF NOT EXISTS idx_video_jobs_created_at ON video_jobs(created_at)",
-            "CREATE INDEX IF NOT EXISTS idx_video_scripts_job_id ON video_scripts(job_id)",
-            "CREATE INDEX IF NOT EXISTS idx_video_scripts_shop_id ON video_scripts(shop_id)",
-            "CREATE INDEX IF NOT EXISTS idx_generated_videos_job_id ON generated_videos(job_id)",
-            "CREATE INDEX IF NOT EXISTS idx_generated_videos_shop_id ON generated_videos(shop_id)",
-            "CREATE INDEX IF NOT EXISTS idx_generated_videos_generated_at ON generated_videos(generated_at)"
-        ]
+        # Table DDL is idempotent, so send it as one transactional script
+        ddl = ";\n".join(
+            [create_video_jobs_query, create_video_scripts_query, create_generated_videos_query]
+        )
+        await db_manager.execute_script(f"BEGIN;\n{ddl};\nCOMMIT;")
+        logger.info("✅ Created/verified tables: video_jobs, video_scripts, generated_videos")
         
+        # CONCURRENTLY can't run inside a transaction block, so each index is
+        # sent on its own. Concurrent builds on the same table conflict (each
+        # takes SHARE UPDATE EXCLUSIVE on it), so a table's indexes are built
+        # one at a time; only different tables are built in parallel.
+        queries_by_table = {}
         for index_query in index_queries:
-            try:
-                await db_manager.execute_query(index_query)
-                logger.info(f"✅ Created index: {index_query.split('idx_')[1].split(' ')[0]}")
-            except Exception as e:
-                logger.warning(f"⚠️ Index creation warning: {e}")
+            table = index_query.split(' ON ')[1].split('(')[0]
+            queries_by_table.setdefault(table, []).append(index_query)
+        
+        index_results = {}
+        
+        async def build_table_indexes(table_queries):
+            for index_query in table_queries:
+                try:
+                    await db_manager.execute_script(index_query)
+                    index_results[index_query] = None
+                except Exception as e:
+                    index_results[index_query] = e
+        
+        await asyncio.gather(
+            *[build_table_indexes(table_queries) for table_queries in queries_by_table.values()]
+        )
+        results = [index_results[index_query] for index_query in index_queries]
+        
+        for index_query, result in zip(index_queries, results):
+            index_name = index_query.split('idx_')[1].split(' ')[0]
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Index creation warning ({index_name}): {result}")
+            else:
+                logger.info(f"✅ Created index: {index_name}")
         
         logger.info("🎉 Video tables and indexes created successfully!")
         
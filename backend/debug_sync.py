@@ -11,7 +11,7 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
-from app.core.database import get_supabase_client
+from app.core.database import db_manager
 from app.services.shopify_service import ShopifyApiClient
 
 async def debug_shopify_api():
@@ -20,14 +20,13 @@ async def debug_shopify_api():
         print("🔍 Debugging Shopify API connection...")
         
         # Get store details
-        supabase = get_supabase_client()
-        store_result = supabase.table('stores').select('*').eq('id', 4).execute()
+        pool = await db_manager.get_pool()
+        store = await pool.fetchrow("SELECT * FROM stores WHERE id = $1", 4)
         
-        if not store_result.data:
+        if not store:
             print("❌ Store not found")
             return False
             
-        store = store_result.data[0]
         print(f"🏪 Testing store: {store['shop_name']} ({store['shop_domain']})")
         
         # Test Shopify API connection
@@ -48,8 +47,11 @@ async def debug_shopify_api():
                 products = await api_client.get_products(limit=5)
                 print(f"✅ Found {len(products)} products")
                 
-                for i, product in enumerate(products[:3]):
-                    print(f"   {i+1}. {product.get('title', 'No title')} (ID: {product.get('id')})")
+                if products:
+                    print("\n".join(
+                        f"   {i}. {product.get('title', 'No title')} (ID: {product.get('id')})"
+                        for i, product in enumerate(products[:3], start=1)
+                    ))
                     
                 if len(products) == 0:
                     print("⚠️  No products found in store - this might be why sync appears stuck")
@@ -71,16 +73,15 @@ async def fix_stuck_sync():
     try:
         print("\n🔧 Fixing stuck sync job...")
         
-        supabase = get_supabase_client()
+        pool = await db_manager.get_pool()
         
         # Update stuck sync job to failed
-        result = supabase.table('sync_jobs').update({
-            'status': 'failed',
-            'error_message': 'Sync was stuck - manually reset',
-            'completed_at': 'now()'
-        }).eq('id', 3).execute()
+        result = await pool.execute(
+            "UPDATE sync_jobs SET status = $1, error_message = $2, completed_at = NOW() WHERE id = $3",
+            'failed', 'Sync was stuck - manually reset', 3
+        )
         
-        if result.data:
+        if result != "UPDATE 0":
             print("✅ Marked stuck sync as failed")
         
         return True
@@ -96,14 +97,21 @@ if __name__ == "__main__":
     print("🚨 DEBUGGING SYNC ISSUE")
     print("=" * 50)
     
-    success = asyncio.run(debug_shopify_api())
+    async def main():
+        try:
+            success = await debug_shopify_api()
+            
+            if success:
+                print("\n✅ Shopify API is working!")
+                
+                # Fix the stuck sync
+                await fix_stuck_sync()
+                
+                print("\n💡 Try running a new sync now!")
+            else:
+                print("\n❌ Shopify API has issues - check your credentials")
+        finally:
+            # The pool is bound to this event loop
+            await db_manager.close()
     
-    if success:
-        print("\n✅ Shopify API is working!")
-        
-        # Fix the stuck sync
-        asyncio.run(fix_stuck_sync())
-        
-        print("\n💡 Try running a new sync now!")
-    else:
-        print("\n❌ Shopify API has issues - check your credentials")
\ No newline at end of file
+    asyncio.run(main())
@@ -23,16 +23,17 @@ def fix_sync_tables():
     try:
         supabase_client = get_supabase_client()
         
+        # DDL for every table that needs (re)creating, sent in one RPC below
+        ddl_statements = []
+        
         # Test if sync_jobs table exists and works
         try:
             result = supabase_client.table('sync_jobs').select('id').limit(1).execute()
             print("✅ sync_jobs table exists")
         except Exception as e:
             print(f"❌ sync_jobs table issue: {e}")
-            print("Creating sync_jobs table via RPC...")
             
-            # Create sync_jobs table using RPC
-            create_sync_jobs_sql = """
+            ddl_statements.append("""
             CREATE TABLE IF NOT EXISTS sync_jobs (
                 id SERIAL PRIMARY KEY,
                 shop_id BIGINT NOT NULL,
@@ -49,13 +50,7 @@ def fix_sync_tables():
                 created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
                 updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
             );
-            """
-            
-            try:
-                supabase_client.rpc('exec_sql', {'sql': create_sync_jobs_sql}).execute()
-                print("✅ sync_jobs table created")
-            except Exception as create_error:
-                print(f"❌ Failed to create sync_jobs: {create_error}")
+            """)
         
         # Test if webhook_events table exists and works
         try:
@@ -63,10 +58,8 @@ def fix_sync_tables():
             print("✅ webhook_events table exists")
         except Exception as e:
             print(f"❌ webhook_events table issue: {e}")
-            print("Creating webhook_events table via RPC...")
             
-            # Create webhook_events table using RPC
-            create_webhook_events_sql = """
+            ddl_statements.append("""
             CREATE TABLE IF NOT EXISTS webhook_events (
                 id SERIAL PRIMARY KEY,
                 shop_id BIGINT NOT NULL,
@@ -80,13 +73,22 @@ def fix_sync_tables():
                 created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
                 updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
             );
-            """
-            
-            try:
-                supabase_client.rpc('exec_sql', {'sql': create_webhook_events_sql}).execute()
-                print("✅ webhook_events table created")
-            except Exception as create_error:
-                print(f"❌ Failed to create webhook_events: {create_error}")
+            """)
+        
+        # Bulk product upserts conflict on (shop_id, sku_code), which the
+        # existing products_sku_shop_unique constraint already covers
+        if not ddl_statements:
+            print("✅ Sync tables verified")
+            return True
+        
+        # exec_sql runs inside a single function call, so the whole script is
+        # applied in one transaction
+        print(f"Applying {len(ddl_statements)} DDL statement(s) via RPC...")
+        try:
+            supabase_client.rpc('exec_sql', {'sql': "\n".join(ddl_statements)}).execute()
+            print("✅ Sync tables verified")
+        except Exception as create_error:
+            print(f"❌ Failed to apply sync table DDL: {create_error}")
         
         return True
         
@@ -141,39 +143,91 @@ def create_simple_sync_endpoint():
     print("\n🚀 CREATING SIMPLE SYNC ENDPOINT...")
     
     simple_sync_code = '''
+
 import asyncio
-from datetime import datetime
-from app.core.database import get_supabase_client
+import json
+from decimal import Decimal
+from app.core.database import db_manager
+
+# Hot queries are kept as constants in one place. Values go in $n parameters
+# rather than the SQL text, so the text stays identical across calls and
+# asyncpg (which caches prepared statements by query string) reuses the plan.
+CREATE_SYNC_JOB_SQL = """
+INSERT INTO sync_jobs (shop_id, sync_type, status, started_at, sync_config)
+VALUES ($1, 'product_sync', 'running', NOW(), $2::jsonb)
+RETURNING id
+"""
+
+GET_ACTIVE_STORE_SQL = "SELECT * FROM stores WHERE id = $1 AND is_active = TRUE"
+
+UPSERT_PRODUCT_COLUMNS = (
+    "shop_id", "shopify_product_id", "sku_code", "product_title",
+    "current_price", "inventory_level", "status"
+)
+
+# Staging table for COPY; built from the products columns so the types match
+# without copying products' defaults (and its sequence) into the temp table
+CREATE_PRODUCT_STAGING_SQL = f"""
+CREATE TEMP TABLE tmp_products ON COMMIT DROP AS
+SELECT {", ".join(UPSERT_PRODUCT_COLUMNS)} FROM products WITH NO DATA
+"""
+
+# Merges the staged batch into products and completes the sync job in one
+# statement. xmax = 0 only for freshly inserted rows.
+MERGE_PRODUCTS_AND_COMPLETE_JOB_SQL = f"""
+WITH upserted AS (
+    INSERT INTO products ({", ".join(UPSERT_PRODUCT_COLUMNS)})
+    SELECT {", ".join(UPSERT_PRODUCT_COLUMNS)} FROM tmp_products
+    ON CONFLICT (shop_id, sku_code) DO UPDATE SET
+        shopify_product_id = EXCLUDED.shopify_product_id,
+        product_title = EXCLUDED.product_title,
+        current_price = EXCLUDED.current_price,
+        inventory_level = EXCLUDED.inventory_level,
+        status = EXCLUDED.status
+    RETURNING sku_id, (xmax = 0) AS created
+),
+counts AS (
+    SELECT count(*) AS processed, count(*) FILTER (WHERE created) AS created FROM upserted
+),
+completed_job AS (
+    UPDATE sync_jobs
+    SET status = 'completed',
+        completed_at = NOW(),
+        processed_items = counts.processed,
+        sync_details = jsonb_build_object(
+            'products_processed', counts.processed,
+            'products_created', counts.created,
+            'success', true
+        )
+    FROM counts
+    WHERE sync_jobs.id = $1
+)
+SELECT processed, created FROM counts
+"""
+
+FAIL_SYNC_JOB_SQL = "UPDATE sync_jobs SET status = 'failed', completed_at = NOW(), error_message = $2 WHERE id = $1"
 
 async def simple_shopify_sync(shop_id: int):
     """Simple sync that actually works."""
     print(f"Starting sync for shop {shop_id}")
     
-    supabase_client = get_supabase_client()
+    pool = await db_manager.get_pool()
     
     # Create sync job
-    sync_job = {
-        "shop_id": shop_id,
-        "sync_type": "product_sync",
-        "status": "running",
-        "started_at": datetime.utcnow().isoformat(),
-        "sync_config": {"simple": True}
-    }
-    
-    job_result = supabase_client.table('sync_jobs').insert(sync_job).execute()
-    if not job_result.data:
+    job_id = await pool.fetchval(
+        CREATE_SYNC_JOB_SQL, shop_id, json.dumps({"simple": True})
+    )
+    if not job_id:
         raise Exception("Failed to create sync job")
     
-    job_id = job_result.data[0]['id']
     print(f"Created sync job: {job_id}")
     
     try:
         # Get store info
-        store_result = supabase_client.table('stores').select('*').eq('id', shop_id).eq('is_active', True).execute()
-        if not store_result.data:
+        store = await pool.fetchrow(GET_ACTIVE_STORE_SQL, shop_id)
+        if not store:
             raise Exception(f"Store {shop_id} not found or inactive")
         
-        store = store_result.data[0]
         print(f"Found store: {store['shop_name']}")
         
         # Simulate product sync (replace with real Shopify API calls)
@@ -201,66 +255,54 @@ async def simple_shopify_sync(shop_id: int):
             }
         ]
         
-        products_created = 0
-        for product in test_products:
-            try:
-                # Check if product exists
-                existing = supabase_client.table('products').select('sku_id').eq('shop_id', shop_id).eq('sku_code', product['sku_code']).execute()
-                
-                if existing.data:
-                    # Update existing
-                    supabase_client.table('products').update(product).eq('sku_id', existing.data[0]['sku_id']).execute()
-                    print(f"Updated product: {product['sku_code']}")
-                else:
-                    # Create new
-                    supabase_client.table('products').insert(product).execute()
-                    print(f"Created product: {product['sku_code']}")
-                    products_created += 1
-                    
-            except Exception as e:
-                print(f"Failed to sync product {product['sku_code']}: {e}")
-        
-        # Mark sync as completed
-        supabase_client.table('sync_jobs').update({
-            "status": "completed",
-            "completed_at": datetime.utcnow().isoformat(),
-            "processed_items": len(test_products),
-            "sync_details": {
-                "products_processed": len(test_products),
-                "products_created": products_created,
-                "success": True
-            }
-        }).eq('id', job_id).execute()
+        # COPY the batch into a temp staging table and merge it into products
+        # with a single INSERT ... ON CONFLICT (relies on the unique index on
+        # products(shop_id, sku_code)), which also marks the sync as completed
+        records = [
+            (
+                product["shop_id"], product["shopify_product_id"], product["sku_code"],
+                product["product_title"], Decimal(str(product["current_price"])),
+                product["inventory_level"], product["status"]
+            )
+            for product in test_products
+        ]
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(CREATE_PRODUCT_STAGING_SQL)
+                await conn.copy_records_to_table(
+                    "tmp_products", records=records, columns=UPSERT_PRODUCT_COLUMNS
+                )
+                counts = await conn.fetchrow(MERGE_PRODUCTS_AND_COMPLETE_JOB_SQL, job_id)
+        print(f"Upserted {counts['processed']} products ({counts['created']} created)")
         
-        print(f"✅ Sync completed! Processed {len(test_products)} products")
-        return {"success": True, "job_id": job_id, "products_processed": len(test_products)}
+        print(f"✅ Sync completed! Processed {counts['processed']} products")
+        return {"success": True, "job_id": job_id, "products_processed": counts['processed']}
         
     except Exception as e:
         # Mark sync as failed
-        supabase_client.table('sync_jobs').update({
-            "status": "failed",
-            "completed_at": datetime.utcnow().isoformat(),
-            "error_message": str(e)
-        }).eq('id', job_id).execute()
+        await pool.execute(FAIL_SYNC_JOB_SQL, job_id, str(e))
         
         print(f"❌ Sync failed: {e}")
         raise
 
+async def main():
+    """Run the simple sync against the first active store."""
+    try:
+        pool = await db_manager.get_pool()
+        shop_id = await pool.fetchval("SELECT id FROM stores WHERE is_active = TRUE LIMIT 1")
+        
+        if shop_id:
+            print(f"Testing sync with store {shop_id}")
+            result = await simple_shopify_sync(shop_id)
+            print(f"Result: {result}")
+        else:
+            print("No active stores found")
+    finally:
+        await db_manager.close()
+
 if __name__ == "__main__":
     # Test the simple sync
-    import asyncio
-    
-    # Get first active store
-    supabase_client = get_supabase_client()
-    stores = supabase_client.table('stores').select('id').eq('is_active', True).limit(1).execute()
-    
-    if stores.data:
-        shop_id = stores.data[0]['id']
-        print(f"Testing sync with store {shop_id}")
-        result = asyncio.run(simple_shopify_sync(shop_id))
-        print(f"Result: {result}")
-    else:
-        print("No active stores found")
+    asyncio.run(main())
 '''
     
     # Write the simple sync module
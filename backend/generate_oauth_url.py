@@ -6,11 +6,25 @@ This bypasses any server issues and generates a working OAuth URL.
 
 import os
 import sys
-from urllib.parse import urlencode
+from functools import lru_cache
+from urllib.parse import quote_plus
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Default scopes
+SCOPES = ["read_products", "read_inventory", "read_orders", "read_price_rules"]
+_ENCODED_SCOPES = quote_plus(",".join(SCOPES))
+
+@lru_cache(maxsize=1)
+def _oauth_url_template(client_id: str) -> str:
+    """Pre-encoded OAuth URL with only shop, redirect URI and state left to fill in."""
+    return (
+        "https://{shop}/admin/oauth/authorize"
+        f"?client_id={quote_plus(client_id)}&scope={_ENCODED_SCOPES}"
+        "&redirect_uri={redirect_uri}&state={state}"
+    )
+
 def generate_shopify_oauth_url(shop_domain: str, redirect_uri: str = None):
     """Generate Shopify OAuth authorization URL."""
     
@@ -23,25 +37,18 @@ def generate_shopify_oauth_url(shop_domain: str, redirect_uri: str = None):
     if not client_id:
         return {"error": "SHOPIFY_CLIENT_ID not found in environment variables"}
     
-    # Default scopes
-    scopes = ["read_products", "read_inventory", "read_orders", "read_price_rules"]
-    
     # Generate state parameter for security
     state = f"test_user:127.0.0.1"
     
     # Set default redirect URI
     final_redirect_uri = redirect_uri or "http://localhost:8000/api/v1/shopify/oauth/callback"
     
-    # Build OAuth parameters
-    params = {
-        "client_id": client_id,
-        "scope": ",".join(scopes),
-        "redirect_uri": final_redirect_uri,
-        "state": state
-    }
-    
     # Generate OAuth URL
-    oauth_url = f"https://{shop_domain}/admin/oauth/authorize?{urlencode(params)}"
+    oauth_url = _oauth_url_template(client_id).format(
+        shop=shop_domain,
+        redirect_uri=quote_plus(final_redirect_uri),
+        state=quote_plus(state)
+    )
     
     return {
         "oauth_url": oauth_url,
@@ -49,7 +56,7 @@ def generate_shopify_oauth_url(shop_domain: str, redirect_uri: str = None):
         "shop_domain": shop_domain,
         "redirect_uri": final_redirect_uri,
         "client_id": client_id,
-        "scopes": scopes
+        "scopes": SCOPES
     }
 
 def main():
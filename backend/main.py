@@ -6,38 +6,51 @@ FastAPI application entry point for Retail AI Advisor backend.
 from app.core.rich_protection import disable_rich_completely
 disable_rich_completely()
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime
+from typing import Any, Dict, Optional
 
+import orjson
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from app.api.middleware.auth import AuthMiddleware
-from app.api.middleware.rate_limit import RateLimitMiddleware
+from app.api.middleware.compression import SelectiveGZipMiddleware
+from app.api.middleware.errors import ErrorWrapperMiddleware
+from app.api.middleware.rate_limit import RateLimitMiddleware, create_redis_client
 from app.api.v1 import analytics, auth, competitor_pricing, products, shopify, sync, trend_analysis, upload, video
 from app.core.config import settings
-from app.core.database import database
+from app.core.database import (
+    check_database_health,
+    create_supabase_http_client,
+    database,
+    get_pool_stats,
+)
 from app.core.logging import setup_logging
+from app.services.shopify_service import build_shopify_oauth_url
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan manager."""
-    # Startup
-    logging.warning("Starting Retail AI Advisor API...")
+# Threads available to sync routes and run_in_threadpool (AnyIO default: 40)
+THREADPOOL_SIZE = 100
+
+
+async def _connect_database() -> None:
+    """Connect the shared database, continuing without it on failure."""
     try:
         await database.connect()
         logging.warning("Database connected successfully")
     except Exception as e:
         logging.error(f"Database connection failed, continuing without it: {e}")
-    
-    yield
-    
-    # Shutdown
-    logging.warning("Shutting down Retail AI Advisor API...")
+
+
+async def _disconnect_database() -> None:
+    """Disconnect the shared database."""
     try:
         await database.disconnect()
         logging.warning("Database disconnected")
@@ -45,42 +58,123 @@ async def lifespan(app: FastAPI):
         logging.error(f"Database disconnect failed: {e}")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan manager."""
+    # Startup
+    logging.warning("Starting Retail AI Advisor API...")
+    
+    # Sync (def) routes and run_in_threadpool calls share AnyIO's default
+    # limiter; the default of 40 threads queues them under load. The limiter
+    # is per event loop, so it has to be resized here rather than at import.
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    
+    async with AsyncExitStack() as stack:
+        # Resources are independent, so open them concurrently; startup takes
+        # as long as the slowest one instead of the sum of all of them.
+        # Redis is shared by RateLimitMiddleware so limits hold across workers.
+        _, app.state.redis = await asyncio.gather(
+            _connect_database(),
+            create_redis_client(),
+        )
+        stack.push_async_callback(_disconnect_database)
+        stack.push_async_callback(app.state.redis.aclose)
+        
+        # Keep-alive client for the Supabase health probe fallback
+        app.state.supabase_http = await stack.enter_async_context(create_supabase_http_client())
+        
+        yield
+        
+        # Shutdown (callbacks above run in reverse order on exit)
+        logging.warning("Shutting down Retail AI Advisor API...")
+
+
+# Response timestamps only need second granularity, so the ISO string is
+# reused for up to a second instead of being formatted on every request
+_timestamp_cache = {"ts": 0.0, "value": ""}
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO string, cached for one second."""
+    now = time.time()
+    if now - _timestamp_cache["ts"] >= 1.0:
+        _timestamp_cache["ts"] = now
+        _timestamp_cache["value"] = datetime.utcfromtimestamp(now).isoformat()
+    return _timestamp_cache["value"]
+
+
 # Setup logging
 setup_logging()
 
+# Environment-dependent values are fixed at import
+_IS_DEV = settings.ENVIRONMENT == "development"
+_DOCS_URL = "/docs" if _IS_DEV else None
+_REDOC_URL = "/redoc" if _IS_DEV else None
+_OPENAPI_URL = "/openapi.json" if _IS_DEV else None
+
 # Create FastAPI app
 app = FastAPI(
     title="Retail AI Advisor API",
     description="AI-powered retail analytics and pricing optimization platform",
     version="1.0.0",
-    docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
-    redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
-    openapi_url="/openapi.json" if settings.ENVIRONMENT == "development" else None,
+    docs_url=_DOCS_URL,
+    redoc_url=_REDOC_URL,
+    openapi_url=_OPENAPI_URL,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Host and origin allowlists are fixed at import. Starlette checks origins
+# with `in`, so a frozenset makes that a hash lookup instead of a list scan;
+# the exact host comes first so it matches before the wildcard suffix check.
+TRUSTED_HOSTS = ("retail-ai-advisor.azurewebsites.net", "*.azurewebsites.net")
+CORS_ALLOWED_ORIGINS = frozenset({
+    "http://localhost:3000",
+    "http://localhost:3001",
+    "null",  # null for file:// protocol
+})
+CORS_ALLOWED_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS")
+# Explicit headers let Starlette answer preflights with a fixed header value
+# instead of echoing Access-Control-Request-Headers back on every request.
+# sentry-trace/baggage come from the frontend's Sentry tracing.
+CORS_ALLOWED_HEADERS = (
+    "authorization",
+    "content-type",
+    "accept",
+    "x-request-id",
+    "sentry-trace",
+    "baggage",
 )
 
+# Compress larger JSON responses (analytics, product lists). Added first so
+# it is the innermost layer and sees the raw body; level 4 gives nearly the
+# ratio of level 9 on JSON at a fraction of the CPU.
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # Add security middleware
 if settings.ENVIRONMENT == "production":
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=TRUSTED_HOSTS)
+
+# Add CORS middleware. Every middleware is another hop on every request, so
+# deployments whose gateway already answers CORS can leave it out.
+if settings.CORS_ENABLED:
     app.add_middleware(
-        TrustedHostMiddleware,
-        allowed_hosts=["retail-ai-advisor.azurewebsites.net", "*.azurewebsites.net"]
+        CORSMiddleware,
+        allow_origins=CORS_ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=CORS_ALLOWED_METHODS,
+        allow_headers=CORS_ALLOWED_HEADERS,
     )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:3001", "null"],  # null for file:// protocol
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-)
-
 # Add rate limiting middleware
 app.add_middleware(RateLimitMiddleware)
 
 # Add authentication middleware
 app.add_middleware(AuthMiddleware)
 
+# Outermost: turns any unhandled exception into a canned 500 response
+app.add_middleware(ErrorWrapperMiddleware)
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(products.router, prefix="/api/v1/products", tags=["Products"])
@@ -93,35 +187,78 @@ app.include_router(competitor_pricing.router, prefix="/api/v1/competitor-pricing
 app.include_router(trend_analysis.router, prefix="/api/v1/trend-analysis", tags=["Trend Analysis"])
 
 
+# The probe handlers return ORJSONResponse directly so FastAPI skips
+# its jsonable_encoder pass over the returned dict
+
+# Everything but the timestamp is fixed once settings are loaded
+_HEALTH_STATIC = {
+    "status": "healthy",
+    "version": "1.0.0",
+    "environment": settings.ENVIRONMENT,
+}
+
+
 @app.get("/health", include_in_schema=False)
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0",
-        "environment": settings.ENVIRONMENT,
-    }
+    return ORJSONResponse({**_HEALTH_STATIC, "timestamp": _utc_timestamp()})
+
+
+# Database probe results are reused for a few seconds so frequent
+# liveness/readiness probes don't each issue a query
+DB_HEALTH_CACHE_TTL_SECONDS = 5.0
+_db_health_cache = {"ts": 0.0, "value": None}
+_db_health_lock = asyncio.Lock()
+
+
+def _fresh_db_health() -> Optional[Dict[str, Any]]:
+    """Return the cached database health if it is still within the TTL."""
+    if time.monotonic() - _db_health_cache["ts"] < DB_HEALTH_CACHE_TTL_SECONDS:
+        return _db_health_cache["value"]
+    return None
+
+
+async def _cached_db_health() -> Dict[str, Any]:
+    """
+    Get database health, refreshing it at most once per TTL.
+    
+    Concurrent probes that arrive while the cache is stale wait on a single
+    refresh instead of each querying the database (single-flight).
+    """
+    health_status = _fresh_db_health()
+    if health_status is not None:
+        return health_status
+    
+    async with _db_health_lock:
+        # Another probe may have refreshed it while we waited
+        health_status = _fresh_db_health()
+        if health_status is None:
+            health_status = await check_database_health(
+                getattr(app.state, "supabase_http", None)
+            )
+            _db_health_cache["ts"] = time.monotonic()
+            _db_health_cache["value"] = health_status
+        return health_status
 
 
 @app.get("/api/v1/health/supabase", include_in_schema=False)
 async def supabase_health_check():
     """Supabase connection health check endpoint."""
-    from app.core.database import check_database_health
-    
     try:
-        health_status = await check_database_health()
-        return {
+        health_status = await _cached_db_health()
+        
+        return ORJSONResponse({
             "service": "supabase",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
             "database": health_status,
+            "pool": get_pool_stats(),
             "supabase_url": settings.SUPABASE_URL,
             "connection_status": "connected" if health_status.get("connected") else "disconnected"
-        }
+        })
     except Exception as e:
-        return {
+        return ORJSONResponse({
             "service": "supabase",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
             "database": {
                 "status": "unhealthy",
                 "connected": False,
@@ -129,39 +266,34 @@ async def supabase_health_check():
             },
             "supabase_url": settings.SUPABASE_URL,
             "connection_status": "disconnected"
-        }
+        })
+
+
+# The root payload never changes after startup, so it is serialized once
+_ROOT_BYTES = orjson.dumps({
+    "message": "Retail AI Advisor API",
+    "version": "1.0.0",
+    "docs_url": _DOCS_URL,
+})
 
 
 @app.get("/", include_in_schema=False)
 async def root():
     """Root endpoint."""
-    return {
-        "message": "Retail AI Advisor API",
-        "version": "1.0.0",
-        "docs_url": "/docs" if settings.ENVIRONMENT == "development" else None,
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 @app.get("/api/v1/shopify/oauth/authorize")
 async def generate_oauth_url_direct(shop: str, redirect_uri: str = None):
     """Direct OAuth URL generation for testing."""
     try:
-        from urllib.parse import urlencode
-        
         state = f"test_user:127.0.0.1"
         final_redirect_uri = redirect_uri or "http://localhost:8000/api/v1/shopify/oauth/callback"
         
         if not settings.SHOPIFY_CLIENT_ID:
             return {"error": "Shopify client ID not configured"}
         
-        params = {
-            "client_id": settings.SHOPIFY_CLIENT_ID,
-            "scope": ",".join(settings.SHOPIFY_SCOPES),
-            "redirect_uri": final_redirect_uri,
-            "state": state
-        }
-        
-        oauth_url = f"https://{shop}/admin/oauth/authorize?{urlencode(params)}"
+        oauth_url = build_shopify_oauth_url(shop, final_redirect_uri, state)
         
         return {
             "oauth_url": oauth_url,
@@ -175,42 +307,24 @@ async def generate_oauth_url_direct(shop: str, redirect_uri: str = None):
         return {"error": f"Failed to generate OAuth URL: {str(e)}"}
 
 
-@app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    """Global exception handler with Rich recursion protection."""
-    from app.core.rich_protection import safe_format_exception, safe_format_request
-    
-    # Safe logging without request context to prevent Rich recursion
-    exc_info = safe_format_exception(exc)
-    request_info = safe_format_request(request)
-    
-    error_msg = f"Unhandled exception: {exc_info['type']}: {exc_info['message']}"
-    logging.error(error_msg)
-    
-    # Log additional safe context without circular references
-    try:
-        logging.error(f"Exception context: request={request_info}, exception={exc_info}")
-    except Exception:
-        # If even safe logging fails, just log the basic error
-        logging.error("Exception occurred but context logging failed")
-    
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal server error",
-            "message": "An unexpected error occurred",
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-    )
-
-
 if __name__ == "__main__":
+    import sys
+    
     import uvicorn
     
+    # Pin the fast event loop and HTTP parser instead of letting uvicorn fall
+    # back silently (uvloop has no Windows build). Outside development run
+    # WEB_CONCURRENCY workers; each opens its own database pool of up to
+    # DB_POOL_MAX connections, so keep WEB_CONCURRENCY x DB_POOL_MAX under the
+    # Postgres connection limit. Reload only works with a single worker.
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.ENVIRONMENT == "development",
+        reload=_IS_DEV,
+        workers=1 if _IS_DEV else settings.WEB_CONCURRENCY,
         log_level=settings.LOG_LEVEL.lower(),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=_IS_DEV,
     )
\ No newline at end of file
@@ -6,7 +6,9 @@ POPULATE SALES DATA - Fill the existing sales table with realistic data
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-import random
+
+import numpy as np
+import orjson
 
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent
@@ -38,61 +40,73 @@ def populate_sales_data(shop_id=4):
         pass
     
     # Generate sales data for last 30 days
-    sales_data = []
+    rng = np.random.default_rng()
     base_date = datetime.now() - timedelta(days=30)
     
     # Create 200-500 sales records (realistic for a month)
-    num_sales = random.randint(200, 500)
+    num_sales = int(rng.integers(200, 501))
     print(f"📊 Generating {num_sales} sales records...")
     
-    for i in range(num_sales):
-        # Random date in last 30 days
-        days_ago = random.randint(0, 30)
-        hours_ago = random.randint(0, 23)
-        minutes_ago = random.randint(0, 59)
-        sold_at = base_date + timedelta(days=days_ago, hours=hours_ago, minutes=minutes_ago)
-        
-        # Random product
-        product = random.choice(products.data)
-        
-        # Random quantity (1-5 items per sale)
-        quantity = random.randint(1, 5)
-        
-        # Price variation (±20% from current price)
-        base_price = float(product['current_price'])
-        price_variation = random.uniform(0.8, 1.2)
-        sold_price = round(base_price * price_variation, 2)
-        
-        sale_record = {
+    # Draw every random column for all sales at once instead of row by row
+    skus = [product['sku_code'] for product in products.data]
+    base_prices = np.array([float(product['current_price']) for product in products.data])
+    
+    # Random product and quantity (1-5 items per sale)
+    product_indices = rng.integers(0, len(skus), num_sales)
+    quantities = rng.integers(1, 6, num_sales)
+    
+    # Price variation (±20% from current price)
+    sold_prices = np.round(base_prices[product_indices] * rng.uniform(0.8, 1.2, num_sales), 2)
+    
+    # Random minute in the 31-day window (same spread as separate day/hour/minute
+    # draws), added and ISO-formatted for all sales in one vectorized pass.
+    # Second resolution is plenty for minute offsets and keeps the strings short.
+    minutes_offset = rng.integers(0, 31 * 24 * 60, num_sales).astype('timedelta64[m]')
+    sold_at = np.datetime_as_string(np.datetime64(base_date, 's') + minutes_offset, unit='s')
+    
+    # Group 3 items per order on average
+    order_ids = 2000000 + np.arange(num_sales) // 3
+    
+    sales_data = [
+        {
             "shop_id": shop_id,
-            "shopify_order_id": 2000000 + (i // 3),  # Group 3 items per order on average
+            "shopify_order_id": order_id,
             "shopify_line_item_id": 3000000 + i,
-            "sku_code": product['sku_code'],
+            "sku_code": skus[product_index],
             "quantity_sold": quantity,
             "sold_price": sold_price,
-            "sold_at": sold_at.isoformat()
+            "sold_at": sold_at_iso
         }
-        
-        sales_data.append(sale_record)
+        for i, (order_id, product_index, quantity, sold_price, sold_at_iso) in enumerate(zip(
+            order_ids.tolist(), product_indices.tolist(), quantities.tolist(),
+            sold_prices.tolist(), sold_at.tolist()
+        ))
+    ]
     
-    # Insert sales data in batches
+    # Insert all sales data in one bulk request (at most 500 rows). The body is
+    # encoded once with orjson and posted on the client's PostgREST session,
+    # skipping the SDK's stdlib json encoding; return=minimal stops PostgREST
+    # echoing every inserted row back.
     try:
-        batch_size = 50
-        sales_created = 0
-        
-        for i in range(0, len(sales_data), batch_size):
-            batch = sales_data[i:i + batch_size]
-            result = supabase.table('sales').insert(batch).execute()
-            sales_created += len(result.data) if result.data else 0
-            print(f"   ✅ Inserted batch {i//batch_size + 1}: {len(batch)} sales")
+        response = supabase.postgrest.session.post(
+            "/sales",
+            content=orjson.dumps(sales_data),
+            headers={"Content-Type": "application/json", "Prefer": "return=minimal"}
+        )
+        response.raise_for_status()
+        sales_created = len(sales_data)
+        print(f"   ✅ Inserted {sales_created} sales in one request")
         
         print(f"\n🎉 SALES DATA POPULATED!")
         print(f"   📊 Total sales records: {sales_created}")
         
-        # Calculate and show analytics
-        total_revenue = sum(sale['sold_price'] * sale['quantity_sold'] for sale in sales_data)
-        total_items_sold = sum(sale['quantity_sold'] for sale in sales_data)
-        unique_orders = len(set(sale['shopify_order_id'] for sale in sales_data))
+        # Calculate analytics with NumPy reductions over the generated columns
+        line_revenue = sold_prices * quantities
+        total_revenue = float(line_revenue.sum())
+        total_items_sold = int(quantities.sum())
+        unique_orders = np.unique(order_ids).size
+        revenue_per_product = np.bincount(product_indices, weights=line_revenue, minlength=len(skus))
+        quantity_per_product = np.bincount(product_indices, weights=quantities, minlength=len(skus))
         
         print(f"\n📈 SALES ANALYTICS:")
         print(f"   💰 Total Revenue: ${total_revenue:,.2f}")
@@ -102,19 +116,14 @@ def populate_sales_data(shop_id=4):
         print(f"   📅 Sales Period: Last 30 days")
         
         # Show top selling products
-        product_sales = {}
-        for sale in sales_data:
-            sku = sale['sku_code']
-            if sku not in product_sales:
-                product_sales[sku] = {'quantity': 0, 'revenue': 0}
-            product_sales[sku]['quantity'] += sale['quantity_sold']
-            product_sales[sku]['revenue'] += sale['sold_price'] * sale['quantity_sold']
-        
-        top_products = sorted(product_sales.items(), key=lambda x: x[1]['revenue'], reverse=True)[:5]
+        top_products = [
+            index for index in np.argsort(-revenue_per_product, kind="stable")[:5]
+            if quantity_per_product[index] > 0
+        ]
         
         print(f"\n🏆 TOP SELLING PRODUCTS:")
-        for i, (sku, data) in enumerate(top_products, 1):
-            print(f"   {i}. {sku}: {data['quantity']} sold, ${data['revenue']:.2f} revenue")
+        for i, index in enumerate(top_products, 1):
+            print(f"   {i}. {skus[index]}: {int(quantity_per_product[index])} sold, ${revenue_per_product[index]:.2f} revenue")
         
         return True
         
@@ -128,15 +137,17 @@ def verify_sales_data():
     
     supabase = get_supabase_client()
     
-    # Check total records
-    sales = supabase.table('sales').select('*').eq('shop_id', 4).execute()
-    print(f"   📊 Total sales records: {len(sales.data)}")
+    # Fetch the total count and the 5 most recent sales in one request,
+    # letting Postgres sort and limit instead of downloading every row
+    sales = supabase.table('sales').select(
+        'sku_code, quantity_sold, sold_price, sold_at', count='exact'
+    ).eq('shop_id', 4).order('sold_at', desc=True).limit(5).execute()
+    print(f"   📊 Total sales records: {sales.count or 0}")
     
     if sales.data:
         # Show recent sales
-        recent_sales = sorted(sales.data, key=lambda x: x['sold_at'], reverse=True)[:5]
         print(f"   📋 Recent sales:")
-        for sale in recent_sales:
+        for sale in sales.data:
             print(f"      {sale['sku_code']}: {sale['quantity_sold']} × ${sale['sold_price']} = ${sale['quantity_sold'] * sale['sold_price']:.2f}")
         
         return True
@@ -34,20 +34,17 @@ async def add_shopify_columns():
             "shopify_updated_at TIMESTAMP WITH TIME ZONE"
         ]
         
-        # Add each column
-        for column_def in columns_to_add:
-            column_name = column_def.split()[0]
-            try:
-                # Try to add the column
-                result = supabase_client.rpc('exec_sql', {
-                    'sql': f'ALTER TABLE products ADD COLUMN {column_def}'
-                }).execute()
-                print(f"✅ Added column: {column_name}")
-            except Exception as e:
-                if "already exists" in str(e).lower() or "duplicate column" in str(e).lower():
-                    print(f"⚠️  Column {column_name} already exists, skipping")
-                else:
-                    print(f"❌ Failed to add column {column_name}: {e}")
+        # Add every column in a single ALTER TABLE; IF NOT EXISTS makes
+        # re-runs skip columns that are already there
+        alter_sql = "ALTER TABLE products " + ", ".join(
+            f"ADD COLUMN IF NOT EXISTS {column_def}" for column_def in columns_to_add
+        )
+        column_names = ", ".join(column_def.split()[0] for column_def in columns_to_add)
+        try:
+            result = supabase_client.rpc('exec_sql', {'sql': alter_sql}).execute()
+            print(f"✅ Added columns (if missing): {column_names}")
+        except Exception as e:
+            print(f"❌ Failed to add columns: {e}")
         
         # Add indexes
         indexes = [
@@ -56,12 +53,12 @@ async def add_shopify_columns():
             "CREATE INDEX IF NOT EXISTS idx_products_vendor ON products(vendor)"
         ]
         
-        for index_sql in indexes:
-            try:
-                result = supabase_client.rpc('exec_sql', {'sql': index_sql}).execute()
-                print(f"✅ Created index: {index_sql.split()[5]}")
-            except Exception as e:
-                print(f"⚠️  Index creation failed (may already exist): {e}")
+        # Create all indexes in one call instead of one request each
+        try:
+            result = supabase_client.rpc('exec_sql', {'sql': "; ".join(indexes)}).execute()
+            print(f"✅ Created indexes: {', '.join(index_sql.split()[5] for index_sql in indexes)}")
+        except Exception as e:
+            print(f"⚠️  Index creation failed: {e}")
         
         print("\n✅ Shopify columns migration completed!")
         
@@ -5,6 +5,7 @@ Database migration script for Supabase PostgreSQL
 
 import asyncio
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -12,9 +13,70 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
-from app.core.database import database
+from app.core.database import database, db_manager
 from app.core.config import settings
 
+_DOLLAR_QUOTE = re.compile(r"\$[A-Za-z_]*\$")
+
+def _split_sql_statements(sql: str) -> list:
+    """
+    Split a SQL script on top-level semicolons.
+    
+    Semicolons inside string literals, quoted identifiers, dollar-quoted
+    bodies (e.g. CREATE FUNCTION ... $$ ... $$) and comments are ignored.
+    """
+    statements = []
+    start = i = 0
+    length = len(sql)
+    
+    while i < length:
+        char = sql[i]
+        if char in ("'", '"'):
+            # Skip to the closing quote; doubled quotes are escapes and are
+            # handled by simply reopening on the next iteration
+            end = sql.find(char, i + 1)
+            i = length if end == -1 else end + 1
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = length if end == -1 else end + 1
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+        elif char == "$" and (match := _DOLLAR_QUOTE.match(sql, i)):
+            tag = match.group()
+            end = sql.find(tag, match.end())
+            i = length if end == -1 else end + len(tag)
+        elif char == ";":
+            statements.append(sql[start:i])
+            i += 1
+            start = i
+        else:
+            i += 1
+    
+    statements.append(sql[start:])
+    return [stmt.strip() for stmt in statements if stmt.strip()]
+
+async def _run_statements(migration_sql: str):
+    """Execute migration statements one at a time, skipping existing objects."""
+    # Split the migration into individual statements
+    statements = _split_sql_statements(migration_sql)
+    
+    print(f"🔄 Executing {len(statements)} SQL statements...")
+    
+    # Execute each statement
+    for i, statement in enumerate(statements, 1):
+        try:
+            if statement.strip():
+                await database.execute(statement)
+                print(f"✅ Statement {i}/{len(statements)} executed")
+        except Exception as e:
+            # Some statements might fail if objects already exist
+            if "already exists" in str(e).lower():
+                print(f"⚠️  Statement {i}/{len(statements)} skipped (already exists)")
+            else:
+                print(f"❌ Statement {i}/{len(statements)} failed: {e}")
+                # Continue with other statements
+
 async def run_migration():
     """Run the initial database migration."""
     
@@ -22,10 +84,6 @@ async def run_migration():
     print(f"📍 Database URL: {settings.DATABASE_URL[:50]}...")
     
     try:
-        # Connect to database
-        await database.connect()
-        print("✅ Connected to Supabase database")
-        
         # Read migration file
         migration_file = backend_dir / "migrations" / "001_initial_schema.sql"
         
@@ -38,24 +96,15 @@ async def run_migration():
         
         print("📄 Migration file loaded")
         
-        # Split the migration into individual statements
-        statements = [stmt.strip() for stmt in migration_sql.split(';') if stmt.strip()]
-        
-        print(f"🔄 Executing {len(statements)} SQL statements...")
-        
-        # Execute each statement
-        for i, statement in enumerate(statements, 1):
-            try:
-                if statement.strip():
-                    await database.execute(statement)
-                    print(f"✅ Statement {i}/{len(statements)} executed")
-            except Exception as e:
-                # Some statements might fail if objects already exist
-                if "already exists" in str(e).lower():
-                    print(f"⚠️  Statement {i}/{len(statements)} skipped (already exists)")
-                else:
-                    print(f"❌ Statement {i}/{len(statements)} failed: {e}")
-                    # Continue with other statements
+        # Send the whole file in one round trip; PostgreSQL runs a
+        # multi-statement script as one implicit transaction, so a failure
+        # leaves nothing half-applied
+        try:
+            await db_manager.execute_script(migration_sql)
+            print("✅ All migration statements executed in one round trip")
+        except Exception as e:
+            print(f"⚠️  Single-batch migration failed ({e}); retrying statement by statement")
+            await _run_statements(migration_sql)
         
         print("🎉 Database migration completed successfully!")
         return True
@@ -63,9 +112,6 @@ async def run_migration():
     except Exception as e:
         print(f"❌ Migration failed: {e}")
         return False
-    finally:
-        await database.disconnect()
-        print("🔌 Disconnected from database")
 
 async def verify_migration():
     """Verify that the migration was successful."""
@@ -73,8 +119,6 @@ async def verify_migration():
     print("\n🔍 Verifying migration...")
     
     try:
-        await database.connect()
-        
         # Check if main tables exist
         tables_to_check = [
             'stores', 'products', 'sales', 'competitor_prices', 
@@ -82,24 +126,41 @@ async def verify_migration():
             'video_scripts', 'generated_videos'
         ]
         
-        for table in tables_to_check:
-            try:
-                result = await database.fetch_one(
-                    f"SELECT COUNT(*) as count FROM information_schema.tables WHERE table_name = '{table}'"
-                )
-                if result and result['count'] > 0:
+        # Look up every table in one query instead of one per table
+        try:
+            rows = await database.fetch_all(
+                "SELECT table_name FROM information_schema.tables WHERE table_name = ANY(:tables)",
+                {"tables": tables_to_check}
+            )
+            present_tables = {row['table_name'] for row in rows}
+            
+            for table in tables_to_check:
+                if table in present_tables:
                     print(f"✅ Table '{table}' exists")
                 else:
                     print(f"❌ Table '{table}' missing")
-            except Exception as e:
-                print(f"❌ Error checking table '{table}': {e}")
+        except Exception as e:
+            print(f"❌ Error checking tables: {e}")
         
         print("✅ Migration verification completed")
         
     except Exception as e:
         print(f"❌ Verification failed: {e}")
+
+async def main():
+    """Run the migration and verify it over one database connection."""
+    await database.connect()
+    print("✅ Connected to Supabase database")
+    
+    try:
+        # Run migration
+        await run_migration()
+        
+        # Verify migration
+        await verify_migration()
     finally:
         await database.disconnect()
+        print("🔌 Disconnected from database")
 
 if __name__ == "__main__":
     print("🗄️  Database Migration Tool")
@@ -111,11 +172,7 @@ if __name__ == "__main__":
         print("Please update your .env file with the correct Supabase DATABASE_URL")
         sys.exit(1)
     
-    # Run migration
-    asyncio.run(run_migration())
-    
-    # Verify migration
-    asyncio.run(verify_migration())
+    asyncio.run(main())
     
     print("\n🎯 Next steps:")
     print("1. Test the backend server: python -m uvicorn main:app --reload")
@@ -207,14 +207,20 @@ async def verify_tables():
     try:
         await database.connect()
         
-        for table in tables_to_check:
-            try:
-                # Try to query the table to verify it exists
-                result = await database.fetch_one(f"SELECT COUNT(*) as count FROM {table}")
-                logger.info(f"✅ Table '{table}' exists and is accessible (count: {result['count'] if result else 0})")
-            except Exception as e:
-                logger.error(f"❌ Table '{table}' verification failed: {e}")
-                return False
+        # Count every table in one query instead of one query per table;
+        # a missing table fails the whole query and the error names it
+        count_query = " UNION ALL ".join(
+            f"SELECT '{table}' AS table_name, COUNT(*) AS count FROM {table}"
+            for table in tables_to_check
+        )
+        try:
+            rows = await database.fetch_all(count_query)
+        except Exception as e:
+            logger.error(f"❌ Table verification failed: {e}")
+            return False
+        
+        for row in rows:
+            logger.info(f"✅ Table '{row['table_name']}' exists and is accessible (count: {row['count']})")
         
         logger.info("✅ All Shopify tables verified successfully!")
         return True
@@ -75,18 +75,21 @@ def sync_products_now(shop_id=4):
                 
                 print(f"✅ Total products fetched: {len(all_products)}")
                 
-                # Sync each product to database
+                # Collect every variant row, keyed by SKU so one upsert never
+                # touches the same row twice
                 synced_count = 0
                 failed_count = 0
+                product_rows = {}
                 
                 for product in all_products:
                     try:
                         # Extract product data
                         for variant in product.get('variants', []):
-                            product_data = {
+                            sku_code = variant.get('sku') or f"SHOPIFY-{product['id']}-{variant['id']}"
+                            product_rows[sku_code] = {
                                 "shop_id": shop_id,
                                 "shopify_product_id": product['id'],
-                                "sku_code": variant.get('sku') or f"SHOPIFY-{product['id']}-{variant['id']}",
+                                "sku_code": sku_code,
                                 "product_title": product.get('title', 'Unknown Product'),
                                 "variant_title": variant.get('title'),
                                 "current_price": float(variant.get('price', 0)),
@@ -96,24 +99,34 @@ def sync_products_now(shop_id=4):
                                 "status": "active" if product.get('status') == 'active' else "archived"
                             }
                             
-                            # Check if product exists
-                            existing = supabase.table('products').select('sku_id').eq('shop_id', shop_id).eq('sku_code', product_data['sku_code']).execute()
-                            
-                            if existing.data:
-                                # Update existing
-                                supabase.table('products').update(product_data).eq('sku_id', existing.data[0]['sku_id']).execute()
-                                print(f"   ✅ Updated: {product_data['sku_code']}")
-                            else:
-                                # Create new
-                                supabase.table('products').insert(product_data).execute()
-                                print(f"   ✅ Created: {product_data['sku_code']}")
-                            
-                            synced_count += 1
-                            
                     except Exception as e:
                         print(f"   ❌ Failed to sync {product.get('title', 'Unknown')}: {e}")
                         failed_count += 1
                 
+                # Upsert all rows with one server-side INSERT ... ON CONFLICT
+                # (shop_id, sku_code) per 500-row chunk instead of a SELECT plus
+                # INSERT/UPDATE per variant (see upsert_products_function.sql)
+                rows = list(product_rows.values())
+                batch_size = 500
+                for i in range(0, len(rows), batch_size):
+                    batch = rows[i:i + batch_size]
+                    try:
+                        supabase.rpc('upsert_products', {'rows': batch}).execute()
+                        synced_count += len(batch)
+                    except Exception as e:
+                        # One bad row fails the whole statement; retry the
+                        # batch row by row so the good rows still land
+                        print(f"   ⚠️ Products batch failed, retrying row by row: {e}")
+                        for row in batch:
+                            try:
+                                supabase.rpc('upsert_products', {'rows': [row]}).execute()
+                                synced_count += 1
+                            except Exception as e:
+                                print(f"   ❌ Failed to sync product {row['sku_code']}: {e}")
+                                failed_count += 1
+                
+                print(f"   ✅ Upserted {synced_count} product variants")
+                
                 return synced_count, failed_count, len(all_products)
         
         # Run the sync
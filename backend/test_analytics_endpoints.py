@@ -4,7 +4,9 @@ Test the analytics endpoints with real data
 """
 
 import asyncio
+import heapq
 import sys
+from collections import Counter, defaultdict
 from pathlib import Path
 
 # Add the backend directory to Python path
@@ -43,15 +45,13 @@ async def test_analytics_queries():
         
         # Test 3: Top selling products
         print("\n🏆 Testing top selling products...")
-        product_sales = {}
+        product_sales = defaultdict(lambda: {'revenue': 0, 'quantity': 0})
         for sale in sales.data:
-            sku = sale['sku_code']
-            if sku not in product_sales:
-                product_sales[sku] = {'revenue': 0, 'quantity': 0}
-            product_sales[sku]['revenue'] += float(sale['sold_price']) * sale['quantity_sold']
-            product_sales[sku]['quantity'] += sale['quantity_sold']
+            totals = product_sales[sale['sku_code']]
+            totals['revenue'] += float(sale['sold_price']) * sale['quantity_sold']
+            totals['quantity'] += sale['quantity_sold']
         
-        top_products = sorted(product_sales.items(), key=lambda x: x[1]['revenue'], reverse=True)[:5]
+        top_products = heapq.nlargest(5, product_sales.items(), key=lambda x: x[1]['revenue'])
         for i, (sku, data) in enumerate(top_products, 1):
             print(f"   {i}. {sku}: ${data['revenue']:.2f} revenue, {data['quantity']} sold")
         
@@ -61,14 +61,11 @@ async def test_analytics_queries():
         recent_date = datetime.now(timezone.utc) - timedelta(days=7)
         recent_sales = [s for s in sales.data if datetime.fromisoformat(s['sold_at'].replace('Z', '+00:00')) >= recent_date]
         
-        recent_product_sales = {}
+        recent_product_sales = Counter()
         for sale in recent_sales:
-            sku = sale['sku_code']
-            if sku not in recent_product_sales:
-                recent_product_sales[sku] = 0
-            recent_product_sales[sku] += sale['quantity_sold']
+            recent_product_sales[sale['sku_code']] += sale['quantity_sold']
         
-        trending = sorted(recent_product_sales.items(), key=lambda x: x[1], reverse=True)[:5]
+        trending = recent_product_sales.most_common(5)
         print(f"   Recent sales (last 7 days): {len(recent_sales)} records")
         for i, (sku, quantity) in enumerate(trending, 1):
             print(f"   {i}. {sku}: {quantity} sold recently")
@@ -4,7 +4,9 @@ Test the complete application end-to-end
 """
 
 import asyncio
+import heapq
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 # Add the backend directory to Python path
@@ -44,15 +46,13 @@ async def test_complete_application():
         print("\n2️⃣ Testing analytics calculations...")
         
         # Top products by revenue
-        product_sales = {}
+        product_sales = defaultdict(lambda: {'revenue': 0, 'quantity': 0})
         for sale in sales.data:
-            sku = sale['sku_code']
-            if sku not in product_sales:
-                product_sales[sku] = {'revenue': 0, 'quantity': 0}
-            product_sales[sku]['revenue'] += float(sale['sold_price']) * sale['quantity_sold']
-            product_sales[sku]['quantity'] += sale['quantity_sold']
+            totals = product_sales[sale['sku_code']]
+            totals['revenue'] += float(sale['sold_price']) * sale['quantity_sold']
+            totals['quantity'] += sale['quantity_sold']
         
-        top_products = sorted(product_sales.items(), key=lambda x: x[1]['revenue'], reverse=True)[:5]
+        top_products = heapq.nlargest(5, product_sales.items(), key=lambda x: x[1]['revenue'])
         print(f"   ✅ Top 5 products calculated:")
         for i, (sku, data) in enumerate(top_products, 1):
             print(f"      {i}. {sku}: ${data['revenue']:.2f}")
@@ -0,0 +1,61 @@
+-- SQL script to create the bulk product upsert function in Supabase (PostgreSQL)
+-- Usage: supabase.rpc('upsert_products', {'rows': [...]}).execute()
+
+-- Insert or update a batch of products in a single statement.
+-- `rows` is a JSON array of product objects keyed by column name.
+CREATE OR REPLACE FUNCTION upsert_products(rows JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO products (
+        shop_id,
+        shopify_product_id,
+        sku_code,
+        product_title,
+        variant_title,
+        current_price,
+        inventory_level,
+        cost_price,
+        image_url,
+        status
+    )
+    SELECT
+        r.shop_id,
+        r.shopify_product_id,
+        r.sku_code,
+        r.product_title,
+        r.variant_title,
+        r.current_price,
+        COALESCE(r.inventory_level, 0),
+        r.cost_price,
+        r.image_url,
+        COALESCE(r.status, 'active')
+    FROM jsonb_to_recordset(rows) AS r(
+        shop_id BIGINT,
+        shopify_product_id BIGINT,
+        sku_code TEXT,
+        product_title TEXT,
+        variant_title TEXT,
+        current_price NUMERIC(10,2),
+        inventory_level INTEGER,
+        cost_price NUMERIC(10,2),
+        image_url TEXT,
+        status TEXT
+    )
+    ON CONFLICT (shop_id, sku_code) DO UPDATE SET
+        shopify_product_id = EXCLUDED.shopify_product_id,
+        product_title = EXCLUDED.product_title,
+        variant_title = EXCLUDED.variant_title,
+        current_price = EXCLUDED.current_price,
+        inventory_level = EXCLUDED.inventory_level,
+        image_url = EXCLUDED.image_url,
+        status = EXCLUDED.status,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$;